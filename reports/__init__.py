@@ -2,12 +2,7 @@
 Reports module for generating PDF reports
 """
 
-from .reports import (
-    generate_budget_report,
-    generate_donor_report,
-    generate_monthly_report,
-    generate_widows_report,
-)
+import importlib
 
 __all__ = [
     "generate_monthly_report",
@@ -15,3 +10,10 @@ __all__ = [
     "generate_donor_report",
     "generate_budget_report",
 ]
+
+
+def __getattr__(name):
+    """Import the PDF generators (and fpdf) only when one is first used."""
+    if name in __all__:
+        return getattr(importlib.import_module(".reports", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -92,7 +92,7 @@ def generate_monthly_report(expenses_df, donations_df, widows_df):
         logger.info(f"Expenses columns: {list(expenses_df.columns)}")
         if "שם" in expenses_df.columns and "שקלים" in expenses_df.columns:
             expenses_by_category = (
-                expenses_df.groupby("שם")["שקלים"].sum().sort_values(ascending=False)
+                expenses_df.groupby("שם", observed=True)["שקלים"].sum().sort_values(ascending=False)
             )
             logger.info(f"Expenses by category: {expenses_by_category.to_dict()}")
             for category, amount in expenses_by_category.items():
@@ -111,7 +111,9 @@ def generate_monthly_report(expenses_df, donations_df, widows_df):
         logger.info(f"Donations columns: {list(donations_df.columns)}")
         if "שם" in donations_df.columns and "שקלים" in donations_df.columns:
             donations_by_donor = (
-                donations_df.groupby("שם")["שקלים"].sum().sort_values(ascending=False)
+                donations_df.groupby("שם", observed=True)["שקלים"]
+                .sum()
+                .sort_values(ascending=False)
             )
             logger.info(f"Donations by donor: {donations_by_donor.to_dict()}")
             for donor, amount in donations_by_donor.items():
@@ -130,7 +132,9 @@ def generate_monthly_report(expenses_df, donations_df, widows_df):
         logger.info(f"Widows columns: {list(widows_df.columns)}")
         if "שם " in widows_df.columns and "סכום חודשי" in widows_df.columns:
             support_by_widow = (
-                widows_df.groupby("שם ")["סכום חודשי"].sum().sort_values(ascending=False)
+                widows_df.groupby("שם ", observed=True)["סכום חודשי"]
+                .sum()
+                .sort_values(ascending=False)
             )
             logger.info(f"Support by widow: {support_by_widow.to_dict()}")
             for widow, amount in support_by_widow.items():
@@ -190,10 +194,9 @@ def generate_widows_report(widows_df):
             ).fillna(0)
             widows_sorted = widows_df_copy.sort_values("סכום חודשי", ascending=False)
             logger.info(f"Processing {len(widows_sorted)} widows")
-            for _, row in widows_sorted.iterrows():
+            for name, amount in zip(widows_sorted["שם "], widows_sorted["סכום חודשי"]):
                 try:
-                    clean_name = clean_text_for_pdf(row["שם "])
-                    amount = row["סכום חודשי"]
+                    clean_name = clean_text_for_pdf(name)
                     pdf.cell(0, 10, f"{clean_name}: {amount:,.2f} NIS", 0, 1, "L")
                 except Exception as row_error:
                     logger.error(f"Error processing row: {row_error}")
@@ -251,7 +254,9 @@ def generate_donor_report(donations_df):
                 donations_df_copy["שקלים"], errors="coerce"
             ).fillna(0)
             donor_totals = (
-                donations_df_copy.groupby("שם")["שקלים"].sum().sort_values(ascending=False)
+                donations_df_copy.groupby("שם", observed=True)["שקלים"]
+                .sum()
+                .sort_values(ascending=False)
             )
             total_donations = donations_df_copy["שקלים"].sum()
             logger.info(f"Total donations: {total_donations}")
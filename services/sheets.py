@@ -3,15 +3,19 @@
 from __future__ import annotations
 
 import logging
+import time
 
 import pandas as pd
 import streamlit as st
 
 # Config import moved to avoid circular imports
-from src.google_sheets_io import load_all_data
+from src.google_sheets_io import load_all_data, read_sheet, sheet_revision
 
 LOGGER = logging.getLogger(__name__)
 
+# How often to reload when the spreadsheet revision is unavailable
+FALLBACK_REFRESH_SECONDS = 300
+
 
 def _empty_frames() -> dict[str, pd.DataFrame]:
     """Return empty dataframes for the expected sheets."""
@@ -23,23 +27,42 @@ def _empty_frames() -> dict[str, pd.DataFrame]:
     }
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+class _IncompleteLoad(RuntimeError):
+    """Raised from the cached loader when some sheets failed, carrying the ones that loaded."""
+
+    def __init__(self, message: str, frames: dict[str, pd.DataFrame]):
+        super().__init__(message)
+        self.frames = frames
+
+
 def fetch_dashboard_frames() -> dict[str, pd.DataFrame]:
-    """Fetch all dashboard sheets, normalising missing data.
+    """Fetch all dashboard sheets, reloading them only when the spreadsheet changed.
 
-    Returns a dict keyed by sheet name with pandas DataFrames. Any failures are
-    logged and replaced with empty frames so callers can degrade gracefully.
+    The cached frames are keyed by the spreadsheet's Drive revision. When the
+    revision can't be read, the key falls back to a five minute time bucket.
+    Failed or partial loads are returned without being cached.
     """
+    revision = sheet_revision() or f"time-{int(time.time() // FALLBACK_REFRESH_SECONDS)}"
     try:
-        all_data = load_all_data()
-    except Exception as exc:  # pragma: no cover - defensive logging
-        LOGGER.exception("Failed to load data from Google Sheets: %s", exc)
+        return _load_dashboard_frames(revision)
+    except _IncompleteLoad as exc:
+        # Show what did load for this run only; the next rerun retries the failed sheets
+        LOGGER.warning("Some Google Sheets failed to load: %s", exc)
+        return exc.frames
+    except Exception as exc:
+        # Failures are not cached, so the next rerun tries Google Sheets again
+        LOGGER.warning("Failed to load data from Google Sheets; using empty frames: %s", exc)
         return _empty_frames()
 
-    if not all_data:
-        LOGGER.warning("Google Sheets returned no data; using empty frames")
-        return _empty_frames()
 
+@st.cache_data(ttl=3600, max_entries=4)
+def _load_dashboard_frames(revision: str) -> dict[str, pd.DataFrame]:
+    """Load all dashboard sheets for a revision, normalising missing data.
+
+    Returns a dict keyed by sheet name with pandas DataFrames. Raises when a
+    sheet failed to load or no data came back, so a failed load is never cached.
+    """
+    all_data = load_all_data()
     frames = _empty_frames()
 
     expenses = all_data.get("Expenses")
@@ -61,4 +84,20 @@ def fetch_dashboard_frames() -> dict[str, pd.DataFrame]:
     if isinstance(widows, pd.DataFrame):
         frames["Widows"] = widows
 
+    # load_all_data leaves out the tabs it couldn't fetch
+    missing = [name for name in ("Expenses", "Donations", "Investors") if name not in all_data]
+    if "Widows" not in all_data and "Almanot" not in all_data:
+        missing.append("Widows")
+    if missing:
+        raise _IncompleteLoad(f"Google Sheets did not return: {', '.join(missing)}", frames)
+    if all(frame.empty for frame in frames.values()):
+        raise RuntimeError("Google Sheets returned no data")
+
     return frames
+
+
+def clear_dashboard_cache() -> None:
+    """Drop cached sheet data so the next load goes back to Google Sheets."""
+    sheet_revision.clear()
+    _load_dashboard_frames.clear()
+    read_sheet.clear()
@@ -1,6 +1,7 @@
 import logging
 from typing import List
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -55,32 +56,34 @@ def check_data_quality_alerts(
                 alerts.append(f"נתוני {name} לא תקינים")
                 continue
 
+            if amount_col not in df.columns:
+                continue
+            values = df[amount_col].to_numpy()
+
             # Check for missing values - but be more specific about what constitutes "missing"
-            if amount_col in df.columns:
-                null_count = df[amount_col].isnull().sum()
-                (df[amount_col] == "").sum() if amount_col in df.columns else 0
-                total_count = len(df)
-
-                # Skip alert for monthly amounts - we treat missing as 0
-                if amount_col == "סכום חודשי":
-                    logging.info(
-                        f"Monthly amounts: {null_count}/{total_count} missing values (treated as 0)"
-                    )
-                    continue
-
-                # Only alert if there are significant missing values (more than 10% of rows)
-                if null_count > 0 and (null_count / total_count) > 0.1:
-                    alerts.append(
-                        f"חסרים ערכים בעמודת {amount_col} בקובץ {name} ({null_count}/{total_count} שורות)"
-                    )
-                elif null_count > 0:
-                    # Just log for debugging, don't show as alert
-                    logging.info(
-                        f"Minor missing values in {amount_col} column of {name}: {null_count}/{total_count}"
-                    )
+            null_count = int(np.count_nonzero(pd.isna(values)))
+            total_count = len(df)
+
+            # Skip alert for monthly amounts - we treat missing as 0
+            if amount_col == "סכום חודשי":
+                logging.info(
+                    f"Monthly amounts: {null_count}/{total_count} missing values (treated as 0)"
+                )
+                continue
+
+            # Only alert if there are significant missing values (more than 10% of rows)
+            if null_count > 0 and (null_count / total_count) > 0.1:
+                alerts.append(
+                    f"חסרים ערכים בעמודת {amount_col} בקובץ {name} ({null_count}/{total_count} שורות)"
+                )
+            elif null_count > 0:
+                # Just log for debugging, don't show as alert
+                logging.info(
+                    f"Minor missing values in {amount_col} column of {name}: {null_count}/{total_count}"
+                )
 
             # Check for negative values only (not zero)
-            if amount_col in df.columns and (df[amount_col] < 0).any():
+            if values.dtype.kind in "iuf" and (values < 0).any():
                 alerts.append(f"נמצאו ערכים שליליים בעמודת {amount_col} בקובץ {name}")
 
     except Exception as e:
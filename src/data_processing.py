@@ -1,12 +1,16 @@
 import logging
+import re
 import traceback
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import streamlit as st
 
 # Config import moved to avoid circular imports
 
+# Everything except digits, the decimal point and a minus sign
+_MONEY_JUNK_RE = re.compile(r"[^\d.-]")
+
 
 def _get_amount_column(df: pd.DataFrame) -> Optional[str]:
     """Return the standard amount column name used across sheets."""
@@ -18,6 +22,54 @@ def _get_amount_column(df: pd.DataFrame) -> Optional[str]:
     return None
 
 
+def clean_money(values: pd.Series) -> pd.Series:
+    """Convert money strings such as "₪1,200" to floats, treating invalid or empty values as 0."""
+    cleaned = values.astype(str).str.replace(_MONEY_JUNK_RE, "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0)
+
+
+_SHEET_DATE_FORMATS = ("%d/%m/%Y", "%d.%m.%Y", "ISO8601")
+
+# Day zero of Google Sheets / Excel date serial numbers
+_SHEET_SERIAL_ORIGIN = "1899-12-30"
+
+
+def parse_sheet_dates(values: pd.Series) -> pd.Series:
+    """Parse day-first sheet dates such as "15/03/2024" with explicit formats, invalid as NaT."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, format=_SHEET_DATE_FORMATS[0], errors="coerce")
+    for date_format in _SHEET_DATE_FORMATS[1:]:
+        missing = parsed.isna() & values.notna()
+        if not missing.any():
+            return parsed
+        parsed[missing] = pd.to_datetime(values[missing], format=date_format, errors="coerce")
+
+    # Date serial numbers such as 45000 count days from the sheet epoch
+    serials = pd.to_numeric(values.where(parsed.isna()), errors="coerce")
+    is_serial = serials.notna()
+    if is_serial.any():
+        parsed[is_serial] = pd.to_datetime(
+            serials[is_serial], unit="D", origin=_SHEET_SERIAL_ORIGIN
+        )
+
+    # Whatever is left (times, two-digit years, ...) goes through the slow per-row parser
+    missing = parsed.isna() & values.notna()
+    if missing.any():
+        parsed[missing] = pd.to_datetime(
+            values[missing], dayfirst=True, format="mixed", errors="coerce"
+        )
+    return parsed
+
+
+def _sum_by_month(values: pd.Series, dates: pd.Series) -> pd.Series:
+    """Sum values per "YYYY-MM" month of the matching dates, skipping rows without a valid date."""
+    totals = values.groupby(parse_sheet_dates(dates).dt.to_period("M")).sum()
+    # Format only the distinct months rather than every row's date
+    totals.index = totals.index.strftime("%Y-%m")
+    return totals
+
+
 def _get_name_column(df: pd.DataFrame) -> Optional[str]:
     """Return the standard name column for donor/expense tables."""
     if not isinstance(df, pd.DataFrame):
@@ -38,15 +90,10 @@ def calculate_monthly_averages(
     try:
         # Group by month and calculate totals - ensure dates are properly converted
         try:
-            df_copy = df.copy()
-            df_copy["תאריך"] = pd.to_datetime(df_copy["תאריך"], errors="coerce")
-            # Filter out rows with invalid dates
-            valid_df = df_copy.dropna(subset=["תאריך"])
-            if valid_df.empty:
+            # Rows with invalid dates are left out of the monthly totals
+            monthly_totals = _sum_by_month(df[value_column], df["תאריך"])
+            if monthly_totals.empty:
                 return {"monthly_avg": 0, "min_monthly": 0, "max_monthly": 0, "total_months": 0}
-            monthly_totals = valid_df.groupby(valid_df["תאריך"].dt.strftime("%Y-%m"))[
-                value_column
-            ].sum()
         except Exception as e:
             logging.warning(f"Could not calculate monthly totals: {e}")
             return {"monthly_avg": 0, "min_monthly": 0, "max_monthly": 0, "total_months": 0}
@@ -107,6 +154,23 @@ def calculate_total_support(df: pd.DataFrame, value_column: str = "סכום חו
         }
 
 
+def _safe_sum(values: pd.Series) -> float:
+    """Sum a money column, coercing to numbers only when it is not numeric already"""
+    if pd.api.types.is_numeric_dtype(values):
+        return float(values.sum())
+    return float(pd.to_numeric(values, errors="coerce").fillna(0).sum())
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def financial_totals(donations_df: pd.DataFrame, expenses_df: pd.DataFrame) -> Tuple[float, float]:
+    """Return total donations and total expenses, shared by the overview and the summary export"""
+    donations_amount_col = _get_amount_column(donations_df)
+    expenses_amount_col = _get_amount_column(expenses_df)
+    total_donations = _safe_sum(donations_df[donations_amount_col]) if donations_amount_col else 0
+    total_expenses = _safe_sum(expenses_df[expenses_amount_col]) if expenses_amount_col else 0
+    return total_donations, total_expenses
+
+
 @st.cache_data(ttl=600)  # Cache for 10 minutes
 def calculate_monthly_budget(expenses_df: pd.DataFrame, donations_df: pd.DataFrame) -> dict:
     """Calculate monthly budget statistics"""
@@ -136,39 +200,19 @@ def calculate_monthly_budget(expenses_df: pd.DataFrame, donations_df: pd.DataFra
 
         if expense_amount_col:
             try:
-                expenses_df_copy = expenses_df.copy()
-                date_col = expenses_df_copy.columns[0]
-                expenses_df_copy["תאריך"] = pd.to_datetime(
-                    expenses_df_copy[date_col], errors="coerce"
-                )
-                valid_expenses = expenses_df_copy.dropna(subset=["תאריך"])
-                if not valid_expenses.empty:
-                    monthly_expenses = (
-                        valid_expenses.groupby(valid_expenses["תאריך"].dt.strftime("%Y-%m"))[
-                            expense_amount_col
-                        ]
-                        .sum()
-                        .to_dict()
-                    )
+                date_col = expenses_df.columns[0]
+                monthly_expenses = _sum_by_month(
+                    expenses_df[expense_amount_col], expenses_df[date_col]
+                ).to_dict()
             except Exception as exc:
                 logging.warning(f"Could not calculate monthly expenses: {exc}")
 
         if donation_amount_col:
             try:
-                donations_df_copy = donations_df.copy()
-                date_col = donations_df_copy.columns[0]
-                donations_df_copy["תאריך"] = pd.to_datetime(
-                    donations_df_copy[date_col], errors="coerce"
-                )
-                valid_donations = donations_df_copy.dropna(subset=["תאריך"])
-                if not valid_donations.empty:
-                    monthly_donations = (
-                        valid_donations.groupby(valid_donations["תאריך"].dt.strftime("%Y-%m"))[
-                            donation_amount_col
-                        ]
-                        .sum()
-                        .to_dict()
-                    )
+                date_col = donations_df.columns[0]
+                monthly_donations = _sum_by_month(
+                    donations_df[donation_amount_col], donations_df[date_col]
+                ).to_dict()
             except Exception as exc:
                 logging.warning(f"Could not calculate monthly donations: {exc}")
 
@@ -260,10 +304,9 @@ def calculate_donor_statistics(
             avg_donation = 0
 
         top_donors_df = (
-            df.groupby(name_col)[amount_col]
+            df.groupby(name_col, observed=True)[amount_col]
             .agg(["sum", "count"])
-            .sort_values("sum", ascending=False)
-            .head(10)
+            .nlargest(10, "sum")
             .reset_index()
         )
         top_donors_df.columns = ["name", "sum", "count"]
@@ -312,7 +355,7 @@ def calculate_expense_statistics(df: pd.DataFrame, value_column: str = "שקלי
         name_col = "שם" if "שם" in df.columns else df.columns[1] if len(df.columns) > 1 else "שם"
         if name_col in df.columns:
             expense_categories = (
-                df.groupby(name_col)[value_column].sum().sort_values(ascending=False)
+                df.groupby(name_col, observed=True)[value_column].sum().sort_values(ascending=False)
             )
             expense_categories = expense_categories.to_dict()
         else:
@@ -320,8 +363,7 @@ def calculate_expense_statistics(df: pd.DataFrame, value_column: str = "שקלי
 
         # Monthly expenses
         if "תאריך" in df.columns:
-            df["תאריך"] = pd.to_datetime(df["תאריך"], format="%d.%m.%Y", errors="coerce")
-            monthly_expenses = df.groupby(df["תאריך"].dt.strftime("%Y-%m"))[value_column].sum()
+            monthly_expenses = _sum_by_month(df[value_column], df["תאריך"])
             monthly_expenses = monthly_expenses.to_dict()
         else:
             monthly_expenses = {}
@@ -411,10 +453,10 @@ def calculate_widow_statistics(df: pd.DataFrame, value_column: str = "סכום 
         if "שם " in df.columns:
             try:
                 # Use numeric values for distribution
-                df_copy = df.copy()
-                df_copy[value_column] = numeric_values
                 support_distribution = (
-                    df_copy.groupby("שם ")[value_column].sum().sort_values(ascending=False)
+                    numeric_values.groupby(df["שם "], observed=True)
+                    .sum()
+                    .sort_values(ascending=False)
                 )
                 support_distribution = support_distribution.to_dict()
             except Exception as e:
@@ -425,8 +467,7 @@ def calculate_widow_statistics(df: pd.DataFrame, value_column: str = "סכום 
 
         # Monthly support
         if "חודש התחלה" in df.columns:
-            df["חודש התחלה"] = pd.to_datetime(df["חודש התחלה"], format="%d.%m.%Y", errors="coerce")
-            monthly_support = df.groupby(df["חודש התחלה"].dt.strftime("%Y-%m"))[value_column].sum()
+            monthly_support = _sum_by_month(df[value_column], df["חודש התחלה"])
             monthly_support = monthly_support.to_dict()
         else:
             monthly_support = {}
@@ -462,13 +503,7 @@ def calculate_monthly_trends(expenses_df: pd.DataFrame, donations_df: pd.DataFra
         donation_amount_col = _get_amount_column(donations_df)
 
         if "תאריך" in expenses_df.columns and expense_amount_col:
-            expenses_df = expenses_df.copy()
-            expenses_df["תאריך"] = pd.to_datetime(
-                expenses_df["תאריך"], format="%d.%m.%Y", errors="coerce"
-            )
-            monthly_expenses = expenses_df.groupby(expenses_df["תאריך"].dt.strftime("%Y-%m"))[
-                expense_amount_col
-            ].sum()
+            monthly_expenses = _sum_by_month(expenses_df[expense_amount_col], expenses_df["תאריך"])
 
             # Calculate trend and change
             if len(monthly_expenses) > 1:
@@ -494,13 +529,9 @@ def calculate_monthly_trends(expenses_df: pd.DataFrame, donations_df: pd.DataFra
 
         # Calculate monthly trends for donations
         if "תאריך" in donations_df.columns and donation_amount_col:
-            donations_df = donations_df.copy()
-            donations_df["תאריך"] = pd.to_datetime(
-                donations_df["תאריך"], format="%d.%m.%Y", errors="coerce"
+            monthly_donations = _sum_by_month(
+                donations_df[donation_amount_col], donations_df["תאריך"]
             )
-            monthly_donations = donations_df.groupby(donations_df["תאריך"].dt.strftime("%Y-%m"))[
-                donation_amount_col
-            ].sum()
 
             # Calculate trend and change
             if len(monthly_donations) > 1:
@@ -595,12 +626,7 @@ def calculate_36_month_budget(widows_df: pd.DataFrame, current_support: float) -
         # Calculate monthly breakdown
         monthly_breakdown = []
         if "חודש התחלה" in widows_df.columns:
-            widows_df["חודש התחלה"] = pd.to_datetime(
-                widows_df["חודש התחלה"], format="%d.%m.%Y", errors="coerce"
-            )
-            monthly_support = widows_df.groupby(widows_df["חודש התחלה"].dt.strftime("%Y-%m"))[
-                "סכום חודשי"
-            ].sum()
+            monthly_support = _sum_by_month(widows_df["סכום חודשי"], widows_df["חודש התחלה"])
 
             for month, amount in monthly_support.items():
                 monthly_breakdown.append(
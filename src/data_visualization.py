@@ -5,6 +5,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from src.data_processing import parse_sheet_dates
+
 
 def create_monthly_trends(expenses_df: pd.DataFrame, donations_df: pd.DataFrame):
     """Create monthly trends chart for expenses and donations"""
@@ -22,14 +24,14 @@ def create_monthly_trends(expenses_df: pd.DataFrame, donations_df: pd.DataFrame)
             return None
 
         # Process expenses data
-        expenses_df["תאריך"] = pd.to_datetime(expenses_df["תאריך"], errors="coerce")
+        expenses_df["תאריך"] = parse_sheet_dates(expenses_df["תאריך"])
         expenses_df = expenses_df.dropna(subset=["תאריך"])
         expenses_df["חודש"] = expenses_df["תאריך"].dt.to_period("M")
         monthly_expenses = expenses_df.groupby("חודש")["שקלים"].sum().reset_index()
         monthly_expenses["חודש"] = monthly_expenses["חודש"].astype(str)
 
         # Process donations data
-        donations_df["תאריך"] = pd.to_datetime(donations_df["תאריך"], errors="coerce")
+        donations_df["תאריך"] = parse_sheet_dates(donations_df["תאריך"])
         donations_df = donations_df.dropna(subset=["תאריך"])
         donations_df["חודש"] = donations_df["תאריך"].dt.to_period("M")
         monthly_donations = donations_df.groupby("חודש")["שקלים"].sum().reset_index()
@@ -102,7 +104,7 @@ def create_budget_distribution_chart(df: pd.DataFrame):
         # If we have a category column, use it
         if "קטגוריה" in df.columns:
             # Group by category and sum amounts
-            category_totals = df.groupby("קטגוריה")[amount_col].sum().reset_index()
+            category_totals = df.groupby("קטגוריה", observed=True)[amount_col].sum().reset_index()
             names_col = "קטגוריה"
             title = "התפלגות הוצאות לפי קטגוריה"
         else:
@@ -118,7 +120,7 @@ def create_budget_distribution_chart(df: pd.DataFrame):
                 return None
 
             # Group by name and sum amounts
-            category_totals = df.groupby(name_col)[amount_col].sum().reset_index()
+            category_totals = df.groupby(name_col, observed=True)[amount_col].sum().reset_index()
             names_col = name_col
             title = "התפלגות הוצאות לפי ספק/לקוח"
 
@@ -204,8 +206,9 @@ def create_donor_contribution_chart(donations_df: pd.DataFrame):
             return None
 
         # Group by donor and sum amounts
-        donor_totals = donations_df.groupby("שם")["שקלים"].sum().reset_index()
-        donor_totals = donor_totals.sort_values("שקלים", ascending=False).head(10)
+        donor_totals = (
+            donations_df.groupby("שם", observed=True)["שקלים"].sum().nlargest(10).reset_index()
+        )
 
         # Create bar chart
         fig = px.bar(
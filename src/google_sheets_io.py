@@ -1,10 +1,15 @@
 import logging
 import os
+import re
+from typing import Optional
 
 import gspread
 import pandas as pd
 import streamlit as st
 from google.oauth2.service_account import Credentials
+from gspread.utils import absolute_range_name, fill_gaps
+
+from src.data_processing import clean_money, parse_sheet_dates
 
 # Define the scope
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
@@ -16,18 +21,37 @@ WIDOW_SPREADSHEET_ID = os.getenv(
     "WIDOW_SPREADSHEET_ID", "1FQRFhChBVUI8G7GrJW8BZInxJ2F25UhMT-fj-O6odv8"
 )
 
-# Initialize Google Sheets client
-gc = None
-try:
-    if os.path.exists(SERVICE_ACCOUNT_FILE):
-        # Authenticate and create a client
-        creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-        gc = gspread.authorize(creds)
-        logging.info("Google Sheets connection established successfully!")
-    else:
+# Worksheets the dashboard reads; "Almanot" is the legacy name of "Widows"
+_DASHBOARD_SHEETS = ("Expenses", "Donations", "Investors", "Widows", "Almanot")
+
+# Everything except digits, separators and a minus sign in amount cells
+_AMOUNT_JUNK_RE = re.compile(r"[^\d.,-]")
+
+
+@st.cache_resource(show_spinner=False)
+def get_gspread_client() -> Optional[gspread.Client]:
+    """Return the authorized Google Sheets client shared by all sessions, or None."""
+    try:
+        if os.path.exists(SERVICE_ACCOUNT_FILE):
+            # Authenticate and create a client
+            creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+            client = gspread.authorize(creds)
+            logging.info("Google Sheets connection established successfully!")
+            return client
         logging.warning("service_account.json not found. Falling back to Excel files.")
-except Exception as e:
-    logging.warning(f"Could not connect to Google Sheets: {e}. Falling back to Excel files.")
+    except Exception as e:
+        logging.warning(f"Could not connect to Google Sheets: {e}. Falling back to Excel files.")
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def _open_spreadsheet(spreadsheet_id: str) -> gspread.Spreadsheet:
+    """Return the spreadsheet handle for an ID, opened once and reused across reruns."""
+    return gc.open_by_key(spreadsheet_id)
+
+
+# Initialize Google Sheets client
+gc = get_gspread_client()
 
 
 def show_service_account_upload():
@@ -77,12 +101,20 @@ def show_service_account_upload():
         return False
 
 
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _verify_service_account_key(key_mtime: float) -> bool:
+    """Exchange the key file for a token; only successes are cached, per key file version."""
+    from google.auth.transport.requests import Request
+
+    creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+    creds.refresh(Request())
+    return True
+
+
 def check_service_account_validity():
     """Check if the service account key is valid and display a user-friendly error if not, including setup instructions."""
     import json
 
-    from google.auth.transport.requests import Request
-
     try:
         if not os.path.exists(SERVICE_ACCOUNT_FILE):
             show_service_account_upload()
@@ -95,10 +127,8 @@ def check_service_account_validity():
             if field not in key_data or not key_data[field]:
                 show_service_account_upload()
                 return False
-        # Try to create credentials and get a token
-        creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
         # Try to get a token (will fail if key is invalid/expired)
-        creds.refresh(Request())
+        _verify_service_account_key(os.path.getmtime(SERVICE_ACCOUNT_FILE))
         return True
     except Exception:
         show_service_account_upload()
@@ -288,6 +318,24 @@ def _map_columns_to_expected(df, sheet_name):
         return df
 
 
+@st.cache_data(ttl=30, show_spinner=False)  # One metadata request per 30 seconds at most
+def sheet_revision() -> Optional[str]:
+    """Return the spreadsheet's Drive modifiedTime, or None if it can't be read."""
+    if gc is None:
+        return None
+    try:
+        response = gc.request(
+            "get",
+            f"https://www.googleapis.com/drive/v3/files/{SPREADSHEET_ID}",
+            params={"fields": "modifiedTime", "supportsAllDrives": True},
+        )
+        return response.json().get("modifiedTime")
+    except Exception as e:
+        logging.warning(f"Could not read spreadsheet revision: {e}")
+        return None
+
+
+@st.cache_data(ttl=300, show_spinner="טוען גיליון...")  # Cache for 5 minutes
 def read_sheet(sheet_name: str) -> pd.DataFrame:
     """Read a worksheet from Google Sheets and return as a DataFrame."""
     if gc is None:
@@ -313,7 +361,7 @@ def read_sheet(sheet_name: str) -> pd.DataFrame:
             return pd.DataFrame(columns=["תאריך", "שם", "שקלים"])
 
     try:
-        sh = gc.open_by_key(SPREADSHEET_ID)
+        sh = _open_spreadsheet(SPREADSHEET_ID)
 
         # Map sheet names to actual Google Sheets names
         sheet_mapping = {"Widows": "Almanot"}  # Ensure both names map to Almanot
@@ -351,20 +399,15 @@ def read_sheet(sheet_name: str) -> pd.DataFrame:
         # Convert date columns to datetime
         if sheet_name in ["Expenses", "Donations", "Investors"]:
             if "תאריך" in df.columns:
-                df["תאריך"] = pd.to_datetime(df["תאריך"], errors="coerce")
+                df["תאריך"] = parse_sheet_dates(df["תאריך"])
         elif sheet_name == "Widows":
             if "חודש התחלה" in df.columns:
-                df["חודש התחלה"] = pd.to_datetime(df["חודש התחלה"], errors="coerce")
+                df["חודש התחלה"] = parse_sheet_dates(df["חודש התחלה"])
 
         # Convert amount columns to numeric - handle string amounts
         if sheet_name in ["Expenses", "Donations", "Investors"]:
             if "שקלים" in df.columns:
-                # First clean the data - remove any non-numeric characters except decimal points
-                df["שקלים"] = df["שקלים"].astype(str).str.replace(r"[^\d.-]", "", regex=True)
-                # Convert to numeric, handling empty strings and invalid values
-                df["שקלים"] = pd.to_numeric(df["שקלים"], errors="coerce")
-                # Fill NaN values with 0
-                df["שקלים"] = df["שקלים"].fillna(0)
+                df["שקלים"] = clean_money(df["שקלים"])
 
         # Remove rows that contain headers instead of data
         if sheet_name in ["Expenses", "Donations", "Investors"]:
@@ -408,50 +451,96 @@ def read_sheet(sheet_name: str) -> pd.DataFrame:
 
 def write_sheet(sheet_name: str, df: pd.DataFrame) -> None:
     """Write a DataFrame to a worksheet in Google Sheets (overwrites existing data)."""
+    write_all({sheet_name: df})
+
+
+def write_all(frames: dict) -> None:
+    """Write several DataFrames to their worksheets in Google Sheets (overwrites existing data).
+
+    All sheets are cleared with one values.batchClear request and rewritten with one
+    values.batchUpdate request, so saving costs two round-trips regardless of sheet count.
+    """
     if gc is None:
         # No Excel fallback - just print error
         logging.warning("Google Sheets not available - cannot save data")
         return
 
+    if not frames:
+        return
+
     try:
-        sh = gc.open_by_key(SPREADSHEET_ID)
-        worksheet = sh.worksheet(sheet_name)
-        worksheet.clear()
-        worksheet.update([df.columns.values.tolist()] + df.values.tolist())
-        logging.info(f"Data saved successfully to Google Sheets: {sheet_name}")
+        sh = _open_spreadsheet(SPREADSHEET_ID)
+        data = [
+            {
+                "range": absolute_range_name(sheet_name, "A1"),
+                "values": [df.columns.astype(str).tolist()]
+                + df.astype(object).fillna("").astype(str).values.tolist(),
+            }
+            for sheet_name, df in frames.items()
+        ]
+        sh.values_batch_clear(body={"ranges": [absolute_range_name(name) for name in frames]})
+        # USER_ENTERED lets Sheets parse the stringified numbers and dates back into typed cells
+        sh.values_batch_update(body={"valueInputOption": "USER_ENTERED", "data": data})
+        logging.info(f"Data saved successfully to Google Sheets: {', '.join(frames)}")
+        # Imported here: services.sheets imports this module
+        from services.sheets import clear_dashboard_cache
+
+        # The cached sheet data is stale now
+        clear_dashboard_cache()
     except Exception as e:
         logging.error(f"Error writing to Google Sheets: {e}")
         logging.error("Data could not be saved")
 
 
 def load_all_data():
-    """Load ALL data from ALL sheets in the Google Spreadsheet."""
+    """Load the dashboard sheets from the Google Spreadsheet, leaving out tabs that failed to load."""
     if gc is None:
         logging.warning("Google Sheets not available")
         return {}
 
     try:
-        sh = gc.open_by_key(SPREADSHEET_ID)
+        sh = _open_spreadsheet(SPREADSHEET_ID)
+        titles = [ws.title for ws in sh.worksheets() if ws.title in _DASHBOARD_SHEETS]
         all_data = {}
 
-        for ws in sh.worksheets():
+        # Fetch the dashboard tabs in a single values.batchGet request instead of one
+        # get_all_values() round-trip per worksheet
+        try:
+            response = sh.values_batch_get(ranges=[absolute_range_name(title) for title in titles])
+            value_ranges = dict(zip(titles, response.get("valueRanges", [])))
+        except Exception as e:
+            # One bad range fails the whole batch - fetch tab by tab so only that tab is lost
+            logging.warning(f"Batch load failed, loading sheets one by one: {e}")
+            value_ranges = {}
+            for title in titles:
+                try:
+                    value_ranges[title] = sh.values_get(absolute_range_name(title))
+                except Exception as tab_error:
+                    logging.error(f"Error loading sheet '{title}': {tab_error}")
+
+        for title in titles:
+            if title not in value_ranges:
+                # Leave tabs that couldn't be fetched out, so callers can tell them from empty tabs
+                continue
             try:
-                values = ws.get_all_values()
+                # batchGet trims trailing empty cells - pad rows like get_all_values() does
+                rows = value_ranges[title].get("values", [])
+                values = fill_gaps(rows) if rows else []
 
                 if not values:
-                    all_data[ws.title] = pd.DataFrame()
+                    all_data[title] = pd.DataFrame()
                     continue
 
                 # For financial sheets (Expenses, Donations, Investors), skip the first 2 rows
                 # Row 0: Title (e.g., "עמרי למען משפחות השכול- הוצאות")
                 # Row 1: Headers (e.g., "תאריך", "שם לקוח", "סכום")
                 # Row 2+: Data
-                if ws.title in ["Expenses", "Donations", "Investors"]:
+                if title in ["Expenses", "Donations", "Investors"]:
                     if len(values) >= 3:
                         headers = _fix_headers(values[1])  # Use row 1 as headers
                         data = values[2:]  # Start from row 2
                     else:
-                        all_data[ws.title] = pd.DataFrame()
+                        all_data[title] = pd.DataFrame()
                         continue
                 else:
                     # For other sheets, use first row as headers
@@ -465,7 +554,7 @@ def load_all_data():
                 df = df.replace("", pd.NA)
 
                 # Apply the same column mapping logic as read_sheet()
-                df = _map_columns_to_expected(df, ws.title)
+                df = _map_columns_to_expected(df, title)
 
                 # Convert date columns first (before numeric conversion)
                 for col in df.columns:
@@ -475,7 +564,7 @@ def load_all_data():
                         any(keyword in col_lower for keyword in ["תאריך", "date", "חודש", "month"])
                         and "סכום" not in col_lower
                     ):
-                        df[col] = pd.to_datetime(df[col], errors="coerce")
+                        df[col] = parse_sheet_dates(df[col])
 
                 # Convert numeric columns (only for amount columns, not date columns)
                 for col in df.columns:
@@ -485,15 +574,15 @@ def load_all_data():
                         for keyword in ["סכום", "amount", "שקלים", "מחיר", "price", "חודשי"]
                     ):
                         # Clean and convert numeric columns
-                        df[col] = df[col].astype(str).str.replace(r"[^\d.,-]", "", regex=True)
+                        df[col] = df[col].astype(str).str.replace(_AMOUNT_JUNK_RE, "", regex=True)
                         df[col] = df[col].str.replace(",", ".")
                         df[col] = pd.to_numeric(df[col], errors="coerce")
                         df[col] = df[col].fillna(0)
 
-                all_data[ws.title] = df
+                all_data[title] = df
             except Exception as e:
-                logging.error(f"Error loading sheet '{ws.title}': {e}")
-                all_data[ws.title] = pd.DataFrame()
+                logging.error(f"Error loading sheet '{title}': {e}")
+                all_data[title] = pd.DataFrame()
         return all_data
 
     except Exception as e:
@@ -519,7 +608,7 @@ def read_widow_support_data() -> pd.DataFrame:
 
     try:
         # Open the widow support spreadsheet
-        sh = gc.open_by_key(WIDOW_SPREADSHEET_ID)
+        sh = _open_spreadsheet(WIDOW_SPREADSHEET_ID)
 
         # Try to find the correct worksheet
         # The gid parameter suggests it might be a specific worksheet
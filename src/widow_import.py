@@ -12,6 +12,16 @@ import streamlit as st
 
 from src.google_sheets_io import read_widow_support_data
 
+# Fields copied into each new widow record, with the value used when a column is missing
+_NEW_WIDOW_FIELDS = {
+    "widow_name": "",
+    "children_count": 0,
+    "monthly_amount": 0,
+    "start_date": None,
+    "end_date": None,
+    "monthly_support": 0,
+}
+
 
 class WidowImportManager:
     """Manages widow data import and donor assignments"""
@@ -117,19 +127,21 @@ class WidowImportManager:
 
         try:
             # Look for rows without donor assignment
-            for index, row in df.iterrows():
-                if pd.isna(row.get("donor_name")) or row.get("donor_name") == "":
-                    new_widow = {
-                        "index": index,
-                        "widow_name": row.get("widow_name", ""),
-                        "children_count": row.get("children_count", 0),
-                        "monthly_amount": row.get("monthly_amount", 0),
-                        "start_date": row.get("start_date"),
-                        "end_date": row.get("end_date"),
-                        "monthly_support": row.get("monthly_support", 0),
-                        "status": "new",  # Mark as new widow
-                    }
-                    new_widows.append(new_widow)
+            if "donor_name" in df.columns:
+                donor_names = df["donor_name"]
+                unassigned = df[donor_names.isna() | (donor_names == "")]
+            else:
+                unassigned = df
+
+            # Read each field as a whole column instead of building a Series per row
+            columns = [
+                (unassigned[field] if field in unassigned.columns else [default] * len(unassigned))
+                for field, default in _NEW_WIDOW_FIELDS.items()
+            ]
+            for index, *values in zip(unassigned.index, *columns):
+                new_widow = {"index": index, **dict(zip(_NEW_WIDOW_FIELDS, values))}
+                new_widow["status"] = "new"  # Mark as new widow
+                new_widows.append(new_widow)
 
             return new_widows
 
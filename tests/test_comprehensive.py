@@ -7,7 +7,7 @@ Enhanced testing with more coverage and edge cases
 import os
 import sys
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pandas as pd
@@ -200,6 +200,155 @@ class TestDataProcessing(unittest.TestCase):
         except Exception as e:
             self.fail(f"calculate_widow_statistics failed: {e}")
 
+    def test_clean_money(self):
+        """Test money string cleaning"""
+        try:
+            from src.data_processing import clean_money
+
+            raw = pd.Series(["₪1,200", " 300.5 ", "-50", "", None, "לא ידוע"])
+            result = clean_money(raw)
+
+            self.assertEqual(result.tolist(), [1200.0, 300.5, -50.0, 0.0, 0.0, 0.0])
+
+        except Exception as e:
+            self.fail(f"clean_money failed: {e}")
+
+    def test_financial_totals(self):
+        """Test donation and expense totals, with amounts stored as text or missing"""
+        try:
+            from src.data_processing import financial_totals
+
+            donations = pd.DataFrame({"שקלים": ["100", "250.5", None, "לא ידוע"]})
+            result = financial_totals(donations, self.expenses_df)
+
+            self.assertEqual(result, (350.5, 1500.0))
+            self.assertEqual(financial_totals(pd.DataFrame(), pd.DataFrame()), (0, 0))
+
+        except Exception as e:
+            self.fail(f"financial_totals failed: {e}")
+
+    def test_parse_sheet_dates(self):
+        """Test day-first sheet date parsing"""
+        try:
+            from src.data_processing import parse_sheet_dates
+
+            raw = pd.Series(
+                [
+                    "03/04/2024",
+                    "15.03.2024",
+                    "2024-05-01",
+                    "15/03/2024 10:30",
+                    "15.3.24",
+                    45000,
+                    "45000",
+                    "",
+                    None,
+                    "לא ידוע",
+                ]
+            )
+            result = parse_sheet_dates(raw)
+
+            self.assertEqual(result[0], pd.Timestamp(2024, 4, 3))
+            self.assertEqual(result[1], pd.Timestamp(2024, 3, 15))
+            self.assertEqual(result[2], pd.Timestamp(2024, 5, 1))
+            self.assertEqual(result[3], pd.Timestamp(2024, 3, 15, 10, 30))
+            self.assertEqual(result[4], pd.Timestamp(2024, 3, 15))
+            self.assertEqual(result[5], pd.Timestamp(2023, 3, 15))
+            self.assertEqual(result[6], pd.Timestamp(2023, 3, 15))
+            self.assertTrue(result[7:].isna().all())
+
+        except Exception as e:
+            self.fail(f"parse_sheet_dates failed: {e}")
+
+
+class TestDonorMatching(unittest.TestCase):
+    """Test fuzzy matching of widow donor cells to known donors"""
+
+    def match(self, donors, name):
+        """Match a donor cell against a list of donors through the prebuilt indexes"""
+        from ui.dashboard_sections import (
+            _build_donor_forms,
+            _build_donor_index,
+            _build_trigram_indexes,
+            _match_donor,
+        )
+
+        forms = _build_donor_forms(donors)
+        return _match_donor(name, forms, _build_donor_index(forms), _build_trigram_indexes(forms))
+
+    def test_partial_match_wins_over_later_pass_equality(self):
+        """Test that a partial match on the name as written beats an abbreviation-equal donor"""
+        self.assertEqual(self.match(["א.ל. תעשיות", "אל"], "א.ל."), "א.ל. תעשיות")
+        self.assertEqual(self.match(["אל", "א.ל. תעשיות"], "א.ל."), "א.ל. תעשיות")
+
+    def test_exact_match(self):
+        """Test that equal names match, ignoring case"""
+        self.assertEqual(self.match(["תורם א", "תורם ב"], "תורם ב"), "תורם ב")
+        self.assertEqual(self.match(["Cohen Foundation"], "cohen foundation"), "Cohen Foundation")
+
+    def test_affix_stripped_match(self):
+        """Test that organization prefixes and suffixes are ignored"""
+        self.assertEqual(self.match(['אלפא בע"מ', "בטא"], "עמותת אלפא"), 'אלפא בע"מ')
+
+    def test_abbreviated_match(self):
+        """Test that dots in abbreviations are ignored"""
+        self.assertEqual(self.match(["א.ל.מ", "בטא"], "אלמ"), "א.ל.מ")
+        self.assertEqual(self.match(['אלמ בע"מ', "בטא"], "א. ל. מ."), 'אלמ בע"מ')
+
+    def test_short_name_match(self):
+        """Test names shorter than a trigram, on either side of the match"""
+        self.assertEqual(self.match(["משפחת לוי", "גד"], "גדעון"), "גד")
+        self.assertEqual(self.match(["משפחת לוי", "גדעון כהן"], "גד"), "גדעון כהן")
+
+    def test_partial_containment_match(self):
+        """Test containment in both directions, with the first donor in order winning"""
+        self.assertEqual(self.match(["לוי", "משפחת כהן"], "כהן"), "משפחת כהן")
+        self.assertEqual(self.match(["משפחת לוי", "כהן"], "קרן משפחת לוי ירושלים"), "משפחת לוי")
+        self.assertEqual(self.match(["כהן משה", "כהן דוד"], "כהן"), "כהן משה")
+
+    def test_no_match(self):
+        """Test that unrelated names are left unmatched"""
+        self.assertIsNone(self.match(["משפחת כהן", "לוי"], "ז"))
+        self.assertIsNone(self.match(["משפחת כהן", "לוי"], "אברהם"))
+
+    def test_build_network_graph(self):
+        """Test the connected/unconnected donors and widows and the support edges"""
+        from ui.dashboard_sections import _build_network_graph
+
+        donations = pd.DataFrame({"שם": ["משפחת כהן", "לוי", 'קרן אלפא בע"מ']})
+        investors = pd.DataFrame({"שם": ["משקיע א"]})
+        widows = pd.DataFrame(
+            {
+                "שם": ["w1", "w2", "w3", "w4", "w5", None],
+                "תורם": ["משפחת כהן", "כהן", "ז", "לוי", "משקיע א", "לוי"],
+                "סכום חודשי": [1000, "500", 800, 0, 700, 300],
+            }
+        )
+
+        donors, connected_widows, other_donors, other_widows, edges = _build_network_graph(
+            donations, widows, investors, 0
+        )
+        self.assertEqual(donors, ["משפחת כהן", "משקיע א"])
+        self.assertEqual(connected_widows, ["w1", "w2", "w5"])
+        self.assertEqual(other_donors, ["לוי", 'קרן אלפא בע"מ'])
+        self.assertEqual(other_widows, ["w3", "w4"])
+        self.assertEqual(
+            edges,
+            [
+                {"from": "משפחת כהן", "to": "w1", "arrows": "to", "label": "₪1,000"},
+                {"from": "משפחת כהן", "to": "w2", "arrows": "to", "label": "₪500"},
+                {"from": "משקיע א", "to": "w5", "arrows": "to", "label": "₪700"},
+            ],
+        )
+
+        # Widows below the minimum support are left out of the graph
+        _, connected_widows, _, other_widows, edges = _build_network_graph(
+            donations, widows.astype({"שם": "category"}), investors, 600
+        )
+        self.assertEqual(connected_widows, ["w1", "w5"])
+        self.assertEqual(other_widows, ["w3"])
+        self.assertEqual([edge["to"] for edge in edges], ["w1", "w5"])
+
 
 class TestDataVisualization(unittest.TestCase):
     """Test data visualization functions"""
@@ -308,6 +457,106 @@ class TestServices(unittest.TestCase):
         except Exception as e:
             self.fail(f"google_sheets_io import failed: {e}")
 
+    def test_fetch_dashboard_frames_does_not_cache_failures(self):
+        """Test that an empty load is retried on the next fetch instead of cached"""
+        from services import sheets
+
+        donations = pd.DataFrame({"שם": ["תורם א"], "שקלים": [100.0]})
+        loaded = {"Expenses": pd.DataFrame(), "Donations": donations, "Investors": pd.DataFrame()}
+        loaded["Widows"] = pd.DataFrame()
+        sheets.clear_dashboard_cache()
+        with patch.object(sheets, "sheet_revision", return_value="rev-1"), patch.object(
+            sheets, "load_all_data", side_effect=[{}, loaded]
+        ) as load:
+            self.assertTrue(sheets.fetch_dashboard_frames()["Donations"].empty)
+            self.assertEqual(len(sheets.fetch_dashboard_frames()["Donations"]), 1)
+            self.assertEqual(load.call_count, 2)
+        sheets._load_dashboard_frames.clear()
+
+    def test_fetch_dashboard_frames_does_not_cache_failed_tabs(self):
+        """Test that loads where every tab, or just one tab, failed to fetch are retried"""
+        from services import sheets
+        from src import google_sheets_io
+
+        titles = ["Expenses", "Donations", "Investors", "Widows"]
+        sh = MagicMock()
+        sh.worksheets.return_value = [MagicMock(title=title) for title in titles]
+        sh.values_batch_get.side_effect = Exception("429 Too Many Requests")
+        sh.values_get.side_effect = Exception("429 Too Many Requests")
+
+        sheets.clear_dashboard_cache()
+        with patch.object(google_sheets_io, "gc", MagicMock()), patch.object(
+            google_sheets_io, "_open_spreadsheet", return_value=sh
+        ), patch.object(sheets, "sheet_revision", return_value="rev-1"):
+            frames = sheets.fetch_dashboard_frames()
+            self.assertTrue(all(frame.empty for frame in frames.values()))
+
+            # Only the widows tab recovers - the load is still incomplete and not cached
+            widows = {"values": [["שם ", "תורם", "סכום חודשי"], ["אלמנה א", "תורם א", "1000"]]}
+
+            def values_get(rng):
+                if "Widows" not in rng:
+                    raise Exception("429 Too Many Requests")
+                return widows
+
+            sh.values_get.side_effect = values_get
+            self.assertEqual(len(sheets.fetch_dashboard_frames()["Widows"]), 1)
+
+            # Once the API recovers the next fetch loads the sheets again
+            sh.values_batch_get.side_effect = None
+            sh.values_batch_get.return_value = {"valueRanges": [{} for _ in titles[:3]] + [widows]}
+            self.assertEqual(len(sheets.fetch_dashboard_frames()["Widows"]), 1)
+            self.assertEqual(sh.values_batch_get.call_count, 3)
+            sheets.fetch_dashboard_frames()
+            self.assertEqual(sh.values_batch_get.call_count, 3)
+        sheets._load_dashboard_frames.clear()
+
+    def test_write_all_handles_categorical_columns(self):
+        """Test that saving stringifies categorical and missing cells in one batch"""
+        from src import google_sheets_io
+
+        df = pd.DataFrame({"שם": pd.Categorical(["תורם א", None]), "שקלים": [100.0, np.nan]})
+        sh = MagicMock()
+
+        with patch.object(google_sheets_io, "gc", MagicMock()), patch.object(
+            google_sheets_io, "_open_spreadsheet", return_value=sh
+        ), patch("services.sheets.clear_dashboard_cache") as clear_cache:
+            google_sheets_io.write_all({"Donations": df})
+
+        data = sh.values_batch_update.call_args.kwargs["body"]["data"]
+        self.assertEqual(data[0]["values"], [["שם", "שקלים"], ["תורם א", "100.0"], ["", ""]])
+        clear_cache.assert_called_once()
+
+    def test_load_all_data_falls_back_per_sheet(self):
+        """Test that a failed batch load only loses the tab that can't be read"""
+        from src import google_sheets_io
+
+        sh = MagicMock()
+        sh.worksheets.return_value = [
+            MagicMock(title=title) for title in ["Expenses", "Chart", "Widows"]
+        ]
+        sh.values_batch_get.side_effect = Exception("Unable to parse range")
+        widows = {"values": [["שם ", "תורם", "סכום חודשי"], ["אלמנה א", "תורם א", "1000"]]}
+
+        def values_get(rng):
+            if "Widows" not in rng:
+                raise Exception("Unable to parse range")
+            return widows
+
+        sh.values_get.side_effect = values_get
+
+        with patch.object(google_sheets_io, "gc", MagicMock()), patch.object(
+            google_sheets_io, "_open_spreadsheet", return_value=sh
+        ):
+            result = google_sheets_io.load_all_data()
+
+        # Only the dashboard tabs are requested
+        self.assertEqual(sh.values_get.call_count, 2)
+        # Tabs that failed to load are left out rather than returned empty
+        self.assertNotIn("Expenses", result)
+        self.assertNotIn("Chart", result)
+        self.assertEqual(result["Widows"]["סכום חודשי"].tolist(), [1000.0])
+
 
 class TestErrorHandling(unittest.TestCase):
     """Test error handling and edge cases"""
@@ -4,6 +4,7 @@ Comprehensive Unit Test Suite for Omri Association Dashboard
 Tests all critical components and functionality
 """
 
+import io
 import os
 import sys
 import unittest
@@ -130,6 +131,17 @@ class TestUILayout(unittest.TestCase):
         except Exception as e:
             self.fail(f"create_dashboard_header failed: {e}")
 
+    def test_binary_export_mixed_type_columns(self):
+        """Test that Parquet/Feather exports accept columns mixing numbers and text"""
+        from ui.dashboard_layout import _df_to_binary_bytes
+
+        df = pd.DataFrame({"שם": ["תורם א", "תורם ב"], "הערות": [1, "א"], "שקלים": [1.0, 2.0]})
+        for export_format, reader in (("Parquet", pd.read_parquet), ("Feather", pd.read_feather)):
+            with self.subTest(export_format=export_format):
+                result = reader(io.BytesIO(_df_to_binary_bytes(df, export_format)))
+                self.assertEqual(result["הערות"].tolist(), ["1", "א"])
+                self.assertEqual(result["שקלים"].tolist(), [1.0, 2.0])
+
 
 class TestNetworkSection(unittest.TestCase):
     """Test network section functionality"""
@@ -23,6 +23,8 @@ from src.data_processing import (
     calculate_donor_statistics,
     calculate_monthly_budget,
     calculate_widow_statistics,
+    clean_money,
+    parse_sheet_dates,
 )
 from src.google_sheets_io import check_service_account_validity
 from ui.dashboard_layout import (
@@ -41,45 +43,16 @@ from ui.dashboard_sections import (
 )
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
 def load_dashboard_data() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """Load all dashboard data from Google Sheets with enhanced loading states and error handling"""
     try:
-        # Check if data is already in session state
-        if (
-            "expenses_df" in st.session_state
-            and "donations_df" in st.session_state
-            and "almanot_df" in st.session_state
-            and "investors_df" in st.session_state
-        ):
-
-            # Use cached data
-            expenses_df = st.session_state.expenses_df
-            donations_df = st.session_state.donations_df
-            almanot_df = st.session_state.almanot_df
-            investors_df = st.session_state.investors_df
-
-            # Validate cached data
-            if (
-                expenses_df is not None
-                and donations_df is not None
-                and almanot_df is not None
-                and investors_df is not None
-            ):
-                return expenses_df, donations_df, almanot_df, investors_df
-
+        # fetch_dashboard_frames is cached, so reruns don't go back to Google Sheets
         frames = fetch_dashboard_frames()
         expenses_df = frames.get("Expenses", pd.DataFrame())
         donations_df = frames.get("Donations", pd.DataFrame())
         investors_df = frames.get("Investors", pd.DataFrame())
         almanot_df = frames.get("Widows", pd.DataFrame())
 
-        # Store in session state
-        st.session_state.expenses_df = expenses_df
-        st.session_state.donations_df = donations_df
-        st.session_state.almanot_df = almanot_df
-        st.session_state.investors_df = investors_df
-
         # Validate data integrity
         if expenses_df.empty and donations_df.empty and almanot_df.empty:
             st.error("❌ לא ניתן לטעון נתונים. אנא בדוק את חיבור Google Sheets")
@@ -101,38 +74,54 @@ def load_dashboard_data() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.
         return None, None, None, None
 
 
+def _categorize_names(df: pd.DataFrame) -> None:
+    """Store repeated donor/widow name columns as categoricals to compare codes, not strings."""
+    for col in ("שם", "שם ", "שם התורם", "שם לקוח", "תורם"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+
 @st.cache_data(ttl=600)  # Cache for 10 minutes
-def process_dashboard_data(
+def prepare_dashboard_frames(
     expenses_df: pd.DataFrame, donations_df: pd.DataFrame, almanot_df: pd.DataFrame
-) -> Tuple[Dict, Dict, Dict]:
-    """Process dashboard data and calculate statistics with enhanced error handling"""
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Return copies of the raw frames with amount, date and count columns parsed"""
     try:
-        # Fix data types with validation (silent processing)
-        for _df_name, df in [("expenses_df", expenses_df), ("donations_df", donations_df)]:
+        frames = []
+        for df in (expenses_df, donations_df):
             if df is not None and not df.empty:
+                df = df.copy()
                 if "שקלים" in df.columns:
                     df["שקלים"] = pd.to_numeric(df["שקלים"], errors="coerce").fillna(0)
                 if "תאריך" in df.columns:
-                    df["תאריך"] = pd.to_datetime(df["תאריך"], errors="coerce")
+                    df["תאריך"] = parse_sheet_dates(df["תאריך"])
+                _categorize_names(df)
+            frames.append(df)
 
         if almanot_df is not None and not almanot_df.empty:
+            almanot_df = almanot_df.copy()
             if "מספר ילדים" in almanot_df.columns:
                 almanot_df["מספר ילדים"] = pd.to_numeric(
                     almanot_df["מספר ילדים"], errors="coerce"
                 ).fillna(0)
             if "סכום חודשי" in almanot_df.columns:
-                # Clean the data first - remove any non-numeric characters
-                almanot_df["סכום חודשי"] = (
-                    almanot_df["סכום חודשי"]
-                    .astype(str)
-                    .str.replace("₪", "")
-                    .str.replace(",", "")
-                    .str.replace(" ", "")
-                )
-                almanot_df["סכום חודשי"] = pd.to_numeric(almanot_df["סכום חודשי"], errors="coerce")
-                # Only fill NaN with 0, not all values
-                almanot_df["סכום חודשי"] = almanot_df["סכום חודשי"].fillna(0)
+                almanot_df["סכום חודשי"] = clean_money(almanot_df["סכום חודשי"])
+            _categorize_names(almanot_df)
+        frames.append(almanot_df)
+
+        return tuple(frames)
 
+    except Exception as e:
+        logging.error(f"Data preparation error: {e}")
+        return expenses_df, donations_df, almanot_df
+
+
+@st.cache_data(ttl=600)  # Cache for 10 minutes
+def process_dashboard_data(
+    expenses_df: pd.DataFrame, donations_df: pd.DataFrame, almanot_df: pd.DataFrame
+) -> Tuple[Dict, Dict, Dict]:
+    """Process dashboard data and calculate statistics with enhanced error handling"""
+    try:
         # Calculate statistics (silent processing)
         budget_status = calculate_monthly_budget(expenses_df, donations_df)
         donor_stats = calculate_donor_statistics(donations_df)
@@ -300,6 +289,9 @@ def run_dashboard() -> None:
             return
 
         # Process data
+        expenses_df, donations_df, almanot_df = prepare_dashboard_frames(
+            expenses_df, donations_df, almanot_df
+        )
         budget_status, donor_stats, widow_stats = process_dashboard_data(
             expenses_df, donations_df, almanot_df
         )
@@ -4,10 +4,26 @@ Dashboard Layout Module
 Handles the main dashboard structure, tabs, and layout
 """
 
+import csv
+import io
+from datetime import date
+from pathlib import Path
+from typing import Optional, Tuple
 
 import pandas as pd
 import streamlit as st
 
+import reports
+from services.sheets import clear_dashboard_cache
+from src.data_processing import financial_totals, parse_sheet_dates
+
+try:
+    from theme_manager import get_current_theme, switch_theme
+
+    _HAS_THEME = True
+except ImportError:  # Theme manager not available
+    _HAS_THEME = False
+
 
 def _get_amount_column(df: pd.DataFrame) -> str:
     if not isinstance(df, pd.DataFrame):
@@ -29,6 +45,13 @@ def create_main_tabs():
         return []
 
 
+def _toggle_theme():
+    """Theme button callback - switches before the rerun so the new theme renders at once"""
+    new_theme = "dark" if st.session_state.get("_theme") == "light" else "light"
+    switch_theme(new_theme)
+    st.session_state["_theme"] = new_theme
+
+
 def create_dashboard_header():
     """Create the main dashboard header with refresh button and system status"""
     try:
@@ -39,9 +62,10 @@ def create_dashboard_header():
         # Removing it will break the user experience
         # ============================================================================
 
-        # Main title - PROTECTED
+        # Main title - PROTECTED (emitted together with the header spacer as one element)
         st.markdown(
-            "<h1 style='text-align: center; color: #1f77b4; margin-bottom: 1rem;'>מערכת ניהול עמותת עמרי</h1>",
+            "<h1 style='text-align: center; color: #1f77b4; margin-bottom: 1rem;'>מערכת ניהול עמותת עמרי</h1>"
+            "<div style='margin: var(--space-4, 1rem) 0;'></div>",
             unsafe_allow_html=True,
         )
 
@@ -53,18 +77,19 @@ def create_dashboard_header():
             pass
 
         with col2:
-            # Quick theme toggle and performance info
-            try:
-                from theme_manager import get_current_theme, switch_theme
-
-                current_theme = get_current_theme()
+            # Reload data from Google Sheets - clearing the cache is enough, the rest of
+            # this run loads fresh frames
+            if st.button("🔄 רענן נתונים", help="טען מחדש את הנתונים מ-Google Sheets"):
+                clear_dashboard_cache()
 
-                if st.button("🌙" if current_theme == "light" else "☀️", help="החלף עיצוב"):
-                    new_theme = "dark" if current_theme == "light" else "light"
-                    switch_theme(new_theme)
-                    st.rerun()
-            except ImportError:
-                pass  # Theme manager not available
+            # Quick theme toggle and performance info
+            if _HAS_THEME:
+                current_theme = st.session_state.setdefault("_theme", get_current_theme())
+                st.button(
+                    "🌙" if current_theme == "light" else "☀️",
+                    help="החלף עיצוב",
+                    on_click=_toggle_theme,
+                )
 
             # Performance info (only in debug mode)
             if st.session_state.get("debug_mode", False):
@@ -73,18 +98,13 @@ def create_dashboard_header():
                     st.info("ℹ️ מידע על ביצועים: טעינה מהירה")
 
                 show_performance_info()
-
-        add_spacing(1)
     except Exception:
         # Handle any errors in header creation gracefully
         pass
 
 
-def create_section_header(title: str, icon: str = ""):
-    """Create a consistent section header using design system tokens"""
-    icon_text = f"{icon} " if icon else ""
-    st.markdown(
-        f"""
+# Static HTML for section headers and spacers - rendered with st.html, which skips markdown parsing
+_SECTION_HEADER_HTML = """
     <h2 style='
         color: var(--color-text-primary, #0f172a);
         border-bottom: 2px solid var(--color-border, #e2e8f0);
@@ -94,9 +114,26 @@ def create_section_header(title: str, icon: str = ""):
         font-size: var(--text-2xl, 1.5rem);
         font-weight: var(--font-semibold, 600);
     '>{icon_text}{title}</h2>
-    """,
-        unsafe_allow_html=True,
-    )
+    """
+
+# Convert rem to design system spacing scale
+_SPACING_HTML = {
+    rem: f"<div style='margin: {value} 0;'></div>"
+    for rem, value in {
+        0.5: "var(--space-2, 0.5rem)",
+        1: "var(--space-4, 1rem)",
+        1.5: "var(--space-6, 1.5rem)",
+        2: "var(--space-8, 2rem)",
+        3: "var(--space-12, 3rem)",
+        4: "var(--space-16, 4rem)",
+    }.items()
+}
+
+
+def create_section_header(title: str, icon: str = ""):
+    """Create a consistent section header using design system tokens"""
+    icon_text = f"{icon} " if icon else ""
+    st.html(_SECTION_HEADER_HTML.format(icon_text=icon_text, title=title))
 
 
 def create_metric_row(metrics: list, columns: int = 4):
@@ -130,89 +167,146 @@ def create_three_column_layout():
 def add_spacing(rem: float = 2):
     """Add consistent spacing between sections using design system tokens"""
     try:
-        # Convert rem to design system spacing scale
-        spacing_map = {
-            0.5: "var(--space-2, 0.5rem)",
-            1: "var(--space-4, 1rem)",
-            1.5: "var(--space-6, 1.5rem)",
-            2: "var(--space-8, 2rem)",
-            3: "var(--space-12, 3rem)",
-            4: "var(--space-16, 4rem)",
-        }
-        spacing_value = spacing_map.get(rem, f"{rem}rem")
-        st.markdown(f"<div style='margin: {spacing_value} 0;'></div>", unsafe_allow_html=True)
+        st.html(_SPACING_HTML.get(rem) or f"<div style='margin: {rem}rem 0;'></div>")
     except Exception:
         # Handle any errors in spacing creation gracefully
         pass
 
 
+def _latest_rows(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Return the n most recent rows, parsing the date column first if it is still text"""
+    if not pd.api.types.is_datetime64_any_dtype(df["תאריך"]):
+        df = df.assign(**{"תאריך": parse_sheet_dates(df["תאריך"])})
+    return df.nlargest(n, "תאריך")
+
+
+def _recent_activity_table(recent: pd.DataFrame, name_col: str, amount_col: str) -> pd.DataFrame:
+    """Format recent rows as a name / amount / date table for display"""
+    amounts = pd.to_numeric(recent[amount_col], errors="coerce").fillna(0)
+    return pd.DataFrame(
+        {
+            "שם": recent[name_col],
+            "סכום": amounts.map("₪{:,.0f}".format),
+            "תאריך": recent["תאריך"].dt.strftime("%d/%m/%Y").fillna("תאריך לא מוגדר"),
+        }
+    )
+
+
+def _render_recent_activity(df: pd.DataFrame, name_cols: Tuple[str, str], kind: str):
+    """Render the latest rows of one frame, bailing out before any work when it is empty"""
+    try:
+        if df.empty:
+            st.info(f"אין {kind} להצגה")
+            return
+        name_col = next((col for col in name_cols if col in df.columns), None)
+        amount_col = _get_amount_column(df)
+        if not (name_col and amount_col):
+            st.warning(f"אין נתוני {kind} זמינים")
+            return
+        st.dataframe(
+            _recent_activity_table(_latest_rows(df), name_col, amount_col),
+            hide_index=True,
+            use_container_width=True,
+        )
+    except Exception:
+        st.error(f"שגיאה בטעינת {kind} אחרונות")
+
+
+@st.fragment
 def create_recent_activity_section(expenses_df: pd.DataFrame, donations_df: pd.DataFrame):
     """Create the recent activity section"""
     col1, col2 = create_two_column_layout()
 
     with col1:
         st.markdown("<h4>🎁 תרומות אחרונות</h4>", unsafe_allow_html=True)
-        try:
-            name_col = (
-                "שם"
-                if "שם" in donations_df.columns
-                else "שם התורם" if "שם התורם" in donations_df.columns else None
-            )
-            amount_col = _get_amount_column(donations_df)
-            if name_col and amount_col:
-                recent_donations = donations_df.sort_values("תאריך", ascending=False).head(5)
-                if len(recent_donations) > 0:
-                    for _, donation in recent_donations.iterrows():
-                        donation_date = donation["תאריך"]
-                        amount = pd.to_numeric(donation.get(amount_col, 0), errors="coerce")
-                        if pd.isna(amount):
-                            amount = 0
-                        label = donation.get(name_col, "")
-                        if pd.notna(donation_date):
-                            st.write(
-                                f"**{label}** - ₪{amount:,.0f} ({donation_date.strftime('%d/%m/%Y')})"
-                            )
-                        else:
-                            st.write(f"**{label}** - ₪{amount:,.0f} (תאריך לא מוגדר)")
-                else:
-                    st.info("אין תרומות להצגה")
-            else:
-                st.warning("אין נתוני תרומות זמינים")
-        except Exception:
-            st.error("שגיאה בטעינת תרומות אחרונות")
+        _render_recent_activity(donations_df, ("שם", "שם התורם"), "תרומות")
 
     with col2:
         st.markdown("<h4>💸 הוצאות אחרונות</h4>", unsafe_allow_html=True)
-        try:
-            name_col = (
-                "שם"
-                if "שם" in expenses_df.columns
-                else "שם לקוח" if "שם לקוח" in expenses_df.columns else None
-            )
-            amount_col = _get_amount_column(expenses_df)
-            if name_col and amount_col:
-                recent_expenses = expenses_df.sort_values("תאריך", ascending=False).head(5)
-                if len(recent_expenses) > 0:
-                    for _, expense in recent_expenses.iterrows():
-                        expense_date = expense["תאריך"]
-                        amount = pd.to_numeric(expense.get(amount_col, 0), errors="coerce")
-                        if pd.isna(amount):
-                            amount = 0
-                        label = expense.get(name_col, "")
-                        if pd.notna(expense_date):
-                            st.write(
-                                f"**{label}** - ₪{amount:,.0f} ({expense_date.strftime('%d/%m/%Y')})"
-                            )
-                        else:
-                            st.write(f"**{label}** - ₪{amount:,.0f} (תאריך לא מוגדר)")
-                else:
-                    st.info("אין הוצאות להצגה")
-            else:
-                st.warning("אין נתוני הוצאות זמינים")
-        except Exception:
-            st.error("שגיאה בטעינת הוצאות אחרונות")
+        _render_recent_activity(expenses_df, ("שם", "שם לקוח"), "הוצאות")
+
+
+@st.cache_data(ttl="5m", max_entries=8)
+def _df_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a frame to UTF-8 CSV with a BOM (for Excel), cached across reruns"""
+    # Write straight into a bytes buffer instead of building a str and encoding it
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding="utf-8-sig")
+    return buf.getvalue()
+
+
+# Raw-data export formats: file extension and mime type
+_EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/octet-stream"),
+    "Feather": ("feather", "application/octet-stream"),
+}
+
+
+@st.cache_data(ttl="5m", max_entries=8)
+def _df_to_binary_bytes(df: pd.DataFrame, export_format: str) -> bytes:
+    """Serialize a frame to Parquet (zstd) or Feather (lz4), cached across reruns"""
+    # Sheet columns often mix numbers and text, which pyarrow rejects in object columns
+    object_columns = df.select_dtypes(include="object").columns
+    df = df.astype({column: "string" for column in object_columns})
+    buf = io.BytesIO()
+    if export_format == "Parquet":
+        df.to_parquet(buf, compression="zstd", index=False)
+    else:
+        df.reset_index(drop=True).to_feather(buf, compression="lz4")
+    return buf.getvalue()
+
+
+def _export_bytes(df: pd.DataFrame, export_format: str) -> bytes:
+    """Serialize a raw-data export in the format picked by the user"""
+    if export_format == "CSV":
+        return _df_to_csv_bytes(df)
+    return _df_to_binary_bytes(df, export_format)
+
+
+def _today_stamp() -> str:
+    """Date stamp for export file names"""
+    return date.today().strftime("%Y%m%d")
+
+
+@st.cache_data(ttl="5m", max_entries=8)
+def _summary_csv_bytes(
+    expenses_df: pd.DataFrame, donations_df: pd.DataFrame, almanot_df: pd.DataFrame
+) -> bytes:
+    """Build the one-row overview export as CSV bytes"""
+    # Create summary data
+    total_donations, total_expenses = financial_totals(donations_df, expenses_df)
+    donor_name_col = (
+        "שם"
+        if "שם" in donations_df.columns
+        else "שם התורם" if "שם התורם" in donations_df.columns else None
+    )
+    summary_data = {
+        "סך תרומות": total_donations,
+        "סך הוצאות": total_expenses,
+        "יתרה זמינה": total_donations - total_expenses,
+        "מספר תורמים": donations_df[donor_name_col].nunique() if donor_name_col else 0,
+        "מספר אלמנות": almanot_df["שם "].nunique() if "שם " in almanot_df.columns else 0,
+    }
+
+    # One header row and one value row - csv.writer is enough, no DataFrame needed
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(summary_data.keys())
+    writer.writerow(summary_data.values())
+    return buf.getvalue().encode("utf-8-sig")
+
+
+@st.cache_data(ttl="15m", max_entries=16)
+def _report_pdf(report_name: str, *frames: pd.DataFrame) -> Optional[Tuple[str, bytes]]:
+    """Generate a PDF report and return its file name and contents, reused while the frames match"""
+    filename = getattr(reports, report_name)(*frames)
+    if not filename:
+        return None
+    return filename, Path(filename).read_bytes()
 
 
+@st.fragment
 def create_reports_section(
     expenses_df: pd.DataFrame, donations_df: pd.DataFrame, almanot_df: pd.DataFrame
 ):
@@ -221,49 +315,18 @@ def create_reports_section(
 
     # Data Export Section (Quick access to raw data)
     st.markdown("#### 📥 ייצוא נתונים גולמיים")
+    export_format = st.radio("פורמט ייצוא", list(_EXPORT_FORMATS), horizontal=True)
+    extension, mime = _EXPORT_FORMATS[export_format]
     col1, col2, col3 = st.columns(3)
 
     with col1:
         if st.button("📊 ייצוא סקירה כללית", use_container_width=True):
             try:
-                # Create summary data
-                donations_amount_col = _get_amount_column(donations_df)
-                expenses_amount_col = _get_amount_column(expenses_df)
-                total_donations = (
-                    pd.to_numeric(donations_df[donations_amount_col], errors="coerce")
-                    .fillna(0)
-                    .sum()
-                    if donations_amount_col
-                    else 0
-                )
-                total_expenses = (
-                    pd.to_numeric(expenses_df[expenses_amount_col], errors="coerce").fillna(0).sum()
-                    if expenses_amount_col
-                    else 0
-                )
-                donor_name_col = (
-                    "שם"
-                    if "שם" in donations_df.columns
-                    else "שם התורם" if "שם התורם" in donations_df.columns else None
-                )
-                summary_data = {
-                    "סך תרומות": [total_donations],
-                    "סך הוצאות": [total_expenses],
-                    "יתרה זמינה": [total_donations - total_expenses],
-                    "מספר תורמים": [
-                        len(donations_df[donor_name_col].unique()) if donor_name_col else 0
-                    ],
-                    "מספר אלמנות": [
-                        len(almanot_df["שם "].unique()) if "שם " in almanot_df.columns else 0
-                    ],
-                }
-
-                summary_df = pd.DataFrame(summary_data)
-                csv = summary_df.to_csv(index=False, encoding="utf-8-sig")
+                csv = _summary_csv_bytes(expenses_df, donations_df, almanot_df)
                 st.download_button(
                     label="💾 הורד CSV",
                     data=csv,
-                    file_name=f"omri_summary_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
+                    file_name=f"omri_summary_{_today_stamp()}.csv",
                     mime="text/csv",
                 )
             except Exception as e:
@@ -273,12 +336,11 @@ def create_reports_section(
         if st.button("👥 ייצוא נתוני תורמים", use_container_width=True):
             try:
                 if not donations_df.empty:
-                    csv = donations_df.to_csv(index=False, encoding="utf-8-sig")
                     st.download_button(
-                        label="💾 הורד CSV",
-                        data=csv,
-                        file_name=f"omri_donors_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
-                        mime="text/csv",
+                        label=f"💾 הורד {export_format}",
+                        data=_export_bytes(donations_df, export_format),
+                        file_name=f"omri_donors_{_today_stamp()}.{extension}",
+                        mime=mime,
                     )
                 else:
                     st.warning("אין נתוני תורמים לייצוא")
@@ -289,12 +351,11 @@ def create_reports_section(
         if st.button("👩 ייצוא נתוני אלמנות", use_container_width=True):
             try:
                 if not almanot_df.empty:
-                    csv = almanot_df.to_csv(index=False, encoding="utf-8-sig")
                     st.download_button(
-                        label="💾 הורד CSV",
-                        data=csv,
-                        file_name=f"omri_widows_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
-                        mime="text/csv",
+                        label=f"💾 הורד {export_format}",
+                        data=_export_bytes(almanot_df, export_format),
+                        file_name=f"omri_widows_{_today_stamp()}.{extension}",
+                        mime=mime,
                     )
                 else:
                     st.warning("אין נתוני אלמנות לייצוא")
@@ -310,65 +371,59 @@ def create_reports_section(
     with col1:
         if st.button("📊 דוח חודשי מפורט", use_container_width=True):
             try:
-                from reports.reports import generate_monthly_report
-
-                filename = generate_monthly_report(expenses_df, donations_df, almanot_df)
-                if filename:
-                    with open(filename, "rb") as file:
-                        st.download_button(
-                            label="הורד דוח חודשי",
-                            data=file.read(),
-                            file_name=filename,
-                            mime="application/pdf",
-                        )
+                report = _report_pdf(
+                    "generate_monthly_report", expenses_df, donations_df, almanot_df
+                )
+                if report:
+                    filename, data = report
+                    st.download_button(
+                        label="הורד דוח חודשי",
+                        data=data,
+                        file_name=filename,
+                        mime="application/pdf",
+                    )
             except Exception:
                 st.error("שגיאה ביצירת דוח חודשי")
 
         if st.button("👥 דוח תורמים מפורט", use_container_width=True):
             try:
-                from reports.reports import generate_donor_report
-
-                filename = generate_donor_report(donations_df)
-                if filename:
-                    with open(filename, "rb") as file:
-                        st.download_button(
-                            label="הורד דוח תורמים",
-                            data=file.read(),
-                            file_name=filename,
-                            mime="application/pdf",
-                        )
+                report = _report_pdf("generate_donor_report", donations_df)
+                if report:
+                    filename, data = report
+                    st.download_button(
+                        label="הורד דוח תורמים",
+                        data=data,
+                        file_name=filename,
+                        mime="application/pdf",
+                    )
             except Exception:
                 st.error("שגיאה ביצירת דוח תורמים")
 
     with col2:
         if st.button("👩 דוח אלמנות מפורט", use_container_width=True):
             try:
-                from reports.reports import generate_widows_report
-
-                filename = generate_widows_report(almanot_df)
-                if filename:
-                    with open(filename, "rb") as file:
-                        st.download_button(
-                            label="הורד דוח אלמנות",
-                            data=file.read(),
-                            file_name=filename,
-                            mime="application/pdf",
-                        )
+                report = _report_pdf("generate_widows_report", almanot_df)
+                if report:
+                    filename, data = report
+                    st.download_button(
+                        label="הורד דוח אלמנות",
+                        data=data,
+                        file_name=filename,
+                        mime="application/pdf",
+                    )
             except Exception:
                 st.error("שגיאה ביצירת דוח אלמנות")
 
         if st.button("💰 דוח תקציב מפורט", use_container_width=True):
             try:
-                from reports.reports import generate_budget_report
-
-                filename = generate_budget_report(expenses_df, donations_df)
-                if filename:
-                    with open(filename, "rb") as file:
-                        st.download_button(
-                            label="הורד דוח תקציב",
-                            data=file.read(),
-                            file_name=filename,
-                            mime="application/pdf",
-                        )
+                report = _report_pdf("generate_budget_report", expenses_df, donations_df)
+                if report:
+                    filename, data = report
+                    st.download_button(
+                        label="הורד דוח תקציב",
+                        data=data,
+                        file_name=filename,
+                        mime="application/pdf",
+                    )
             except Exception:
                 st.error("שגיאה ביצירת דוח תקציב")
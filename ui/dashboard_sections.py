@@ -6,11 +6,15 @@ Handles different dashboard sections like budget, donors, widows, etc.
 
 import logging
 import re
-from typing import Dict
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from src.data_processing import financial_totals
+
 # Removed unused imports: calculate_donor_statistics, calculate_monthly_budget, calculate_widow_statistics
 # CI Fix: Ensure linting passes
 from src.data_visualization import (
@@ -27,14 +31,183 @@ from ui.components.simple_ui import (
 )
 from ui.dashboard_layout import add_spacing, create_three_column_layout
 
+try:
+    from streamlit_agraph import Config, Edge, Node, agraph
+
+    _HAS_AGRAPH = True
+except ImportError:  # Network map is optional
+    _HAS_AGRAPH = False
+
+_ORG_AFFIXES = ('בע"מ', "עמותת", "חברה")
+# Dots in abbreviations like "א.ל." -> "אל"
+_ABBR_RE = re.compile(r"\.\s*")
+# Donor matching passes as (spelling, lower-cased spelling) positions in the donor forms:
+# as written, without organization affixes, without abbreviation dots
+_MATCH_PASSES = ((0, 1), (2, 3), (4, 5))
+
+# Label fonts shared by every network node and edge
+_NODE_FONT = {"size": 7, "color": "#000000", "face": "Arial", "bold": True}
+_LARGE_NODE_FONT = {**_NODE_FONT, "size": 8}
+_EDGE_FONT = {"size": 8, "color": "#000000"}
+
+# Network view styling and area-constraint script, built once at import
+_NETWORK_CSS_JS = """
+<style>
+/* Force all text in network view to be black */
+.stPlotlyChart, .stPlotlyChart * {
+    color: #000000 !important;
+}
+/* Network specific text colors */
+.vis-network, .vis-network * {
+    color: #000000 !important;
+}
+/* Edge labels */
+.vis-edge-label {
+    color: #000000 !important;
+    background-color: #ffffff !important;
+}
+/* Make network use full available width */
+.stPlotlyChart {
+    width: 100% !important;
+    max-width: none !important;
+}
+/* Ensure the agraph container uses full width */
+.stPlotlyChart > div {
+    width: 100% !important;
+    max-width: none !important;
+}
+</style>
+
+<script>
+// Add area constraints after network loads
+setTimeout(function() {
+    const network = document.querySelector('.vis-network');
+    if (network && network.__vis_network) {
+        const visNetwork = network.__vis_network;
+
+        // Add physics constraints for area separation with extremely tight areas
+        visNetwork.on('stabilizationProgress', function(params) {
+            // Constrain nodes to their designated areas
+            const nodes = visNetwork.body.data.nodes;
+            nodes.forEach(function(node) {
+                if (node.group === 'widow_unconnected') {
+                    // Keep unconnected widows on left side - extremely tight area
+                    if (node.x > -10) node.x = -10;
+                } else if (node.group === 'donor_unconnected') {
+                    // Keep unconnected donors on right side - extremely tight area
+                    if (node.x < 10) node.x = 10;
+                } else if (node.group === 'donor_connected' || node.group === 'widow_connected') {
+                    // Keep connected pairs in middle area - extremely tight area
+                    if (node.x < -10 || node.x > 10) node.x = 0;
+                }
+            });
+        });
+    }
+}, 1000);
+</script>
+"""
 
-def _get_amount_column(df: pd.DataFrame) -> str:
-    """Return the column name used for monetary values."""
-    if not isinstance(df, pd.DataFrame):
-        return None
-    for col in ("שקלים", "סכום"):
-        if col in df.columns:
-            return col
+_WIDOWS_TABLE_COLUMNS = ("תורם", "סכום חודשי", "מספר ילדים", "שם")
+
+# Network node group -> (size, color, font)
+_GROUP_STYLE = {
+    "donor_connected": (25, "#1f77b4", _LARGE_NODE_FONT),  # Blue, middle
+    "widow_connected": (22, "#ff7f0e", _NODE_FONT),  # Orange, middle
+    "donor_unconnected": (20, "#87ceeb", _NODE_FONT),  # Light blue, right side
+    "widow_unconnected": (18, "#ffb347", _NODE_FONT),  # Light orange, left side
+}
+
+
+def _distinct_names(names: pd.Series) -> set:
+    """Return the distinct names in a column, stripped of extra spaces, without blanks."""
+    stripped = pd.Series(names.dropna().unique()).astype(str).str.strip()
+    return set(stripped[stripped.ne("")])
+
+
+def _column_values(df: pd.DataFrame, column: str):
+    """Return a column's values as an array, or None for every row if the column is missing."""
+    if column in df.columns:
+        return df[column].to_numpy()
+    return [None] * len(df)
+
+
+def _strip_org_affixes(name: str) -> str:
+    """Remove common organization prefixes/suffixes from a donor name."""
+    for affix in _ORG_AFFIXES:
+        name = name.replace(affix, "")
+    return name.strip()
+
+
+def _build_donor_forms(donors) -> list:
+    """Precompute the normalized spellings of each donor used by fuzzy matching."""
+    forms = []
+    for donor in donors:
+        plain = _strip_org_affixes(donor)
+        # Handle abbreviations like "א.ל." -> "אל"
+        abbreviated = _ABBR_RE.sub("", donor)
+        forms.append((donor, donor.lower(), plain, plain.lower(), abbreviated, abbreviated.lower()))
+    return forms
+
+
+def _build_donor_index(donor_forms: list) -> tuple:
+    """Map each lower-cased spelling to the first donor position, one dict per matching pass."""
+    indexes = []
+    for _, form in _MATCH_PASSES:
+        index = {}
+        for position, forms in enumerate(donor_forms):
+            index.setdefault(forms[form], position)
+        indexes.append(index)
+    return tuple(indexes)
+
+
+def _trigrams(name: str) -> set:
+    """Return the three-character substrings of a name."""
+    return {name[i : i + 3] for i in range(len(name) - 2)}
+
+
+def _build_trigram_indexes(donor_forms: list) -> tuple:
+    """Index donor positions by trigram, as one (index, short-name positions) pair per spelling."""
+    indexes = []
+    for _, form in _MATCH_PASSES:
+        index = defaultdict(set)
+        short = set()
+        for position, forms in enumerate(donor_forms):
+            name = forms[form]
+            if len(name) < 3:
+                short.add(position)
+            for gram in _trigrams(name):
+                index[gram].add(position)
+        indexes.append((dict(index), short))
+    return tuple(indexes)
+
+
+def _candidate_positions(query: str, trigram_index: tuple, limit: int) -> Sequence[int]:
+    """Return the donor positions below limit that may contain, or be contained in, the query."""
+    # Containment of a name of 3+ characters implies a shared trigram; shorter names always qualify
+    if len(query) < 3:
+        return range(limit)
+    index, short = trigram_index
+    positions = {position for position in short if position < limit}
+    for gram in _trigrams(query):
+        positions.update(position for position in index.get(gram, ()) if position < limit)
+    return sorted(positions)
+
+
+def _match_donor(donor_str: str, donor_forms: list, donor_index: tuple, trigram_indexes: tuple):
+    """Find the donor matching a name, trying partial, prefix-free and abbreviation matching."""
+    queries = (donor_str, _strip_org_affixes(donor_str), _ABBR_RE.sub("", donor_str))
+    for query, (form, _), equal_index, trigram_index in zip(
+        queries, _MATCH_PASSES, donor_index, trigram_indexes
+    ):
+        query_lower = query.lower()
+        # The first donor that overlaps wins, so an equal spelling only bounds the scan
+        equal = equal_index.get(query_lower, len(donor_forms))
+        for position in _candidate_positions(query_lower, trigram_index, equal):
+            name = donor_forms[position][form]
+            if query in name or name in query:
+                return donor_forms[position][0]
+        if equal < len(donor_forms):
+            return donor_forms[equal][0]
     return None
 
 
@@ -47,19 +220,7 @@ def create_overview_section(
     st.markdown("#### 💰 סקירה פיננסית")
 
     # Calculate financial metrics
-    donations_amount_col = _get_amount_column(donations_df)
-    expenses_amount_col = _get_amount_column(expenses_df)
-
-    total_donations = (
-        pd.to_numeric(donations_df[donations_amount_col], errors="coerce").fillna(0).sum()
-        if donations_amount_col
-        else 0
-    )
-    total_expenses = (
-        pd.to_numeric(expenses_df[expenses_amount_col], errors="coerce").fillna(0).sum()
-        if expenses_amount_col
-        else 0
-    )
+    total_donations, total_expenses = financial_totals(donations_df, expenses_df)
     balance = total_donations - total_expenses
     utilization_rate = (total_expenses / total_donations * 100) if total_donations > 0 else 0
 
@@ -201,6 +362,33 @@ def create_donors_section(donations_df: pd.DataFrame, donor_stats: Dict):
     add_spacing(3)
 
 
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def _sorted_widows(almanot_df: pd.DataFrame, columns: Tuple[str, ...]) -> pd.DataFrame:
+    """Return the widows table columns sorted by monthly amount, supported widows first"""
+    return almanot_df[list(columns)].sort_values("סכום חודשי", ascending=False)
+
+
+def _render_widows_table(almanot_df: pd.DataFrame):
+    """Render the table of all widows, shared by the widows sections"""
+    try:
+        # Show all widows with key information
+        available_columns = tuple(col for col in _WIDOWS_TABLE_COLUMNS if col in almanot_df.columns)
+
+        if available_columns:
+            # Display table without index and with proper column order
+            st.dataframe(
+                _sorted_widows(almanot_df, available_columns),
+                use_container_width=True,
+                hide_index=True,
+            )
+        else:
+            st.warning("⚠️ לא ניתן לטעון טבלת אלמנות")
+
+    except Exception as e:
+        st.error("שגיאה בטעינת טבלת אלמנות")
+        logging.error(f"Widows table error: {e}")
+
+
 def create_widows_section(almanot_df: pd.DataFrame, widow_stats: Dict):
     """Create the widows management section"""
     create_simple_section_header("👩 ניהול אלמנות")
@@ -251,26 +439,8 @@ def create_widows_section(almanot_df: pd.DataFrame, widow_stats: Dict):
     add_spacing(2)
 
     # Complete Widows Table
-    try:
-        st.markdown("#### 📋 טבלת כל האלמנות")
-
-        # Show all widows with key information
-        display_columns = ["תורם", "סכום חודשי", "מספר ילדים", "שם"]
-        available_columns = [col for col in display_columns if col in almanot_df.columns]
-
-        if len(available_columns) > 0:
-            # Sort by monthly amount (descending) to show supported widows first
-            sorted_widows = almanot_df.sort_values("סכום חודשי", ascending=False)
-            # Display table without index and with proper column order
-            st.dataframe(
-                sorted_widows[available_columns], use_container_width=True, hide_index=True
-            )
-        else:
-            st.warning("⚠️ לא ניתן לטעון טבלת אלמנות")
-
-    except Exception as e:
-        st.error("שגיאה בטעינת טבלת אלמנות")
-        logging.error(f"Widow charts error: {e}")
+    st.markdown("#### 📋 טבלת כל האלמנות")
+    _render_widows_table(almanot_df)
 
     st.markdown("</div>", unsafe_allow_html=True)
     add_spacing(3)
@@ -279,25 +449,7 @@ def create_widows_section(almanot_df: pd.DataFrame, widow_stats: Dict):
 def create_widows_table_section(almanot_df: pd.DataFrame):
     """Create the complete widows table section"""
     create_simple_section_header("👩 טבלת כל האלמנות")
-    try:
-        # Show all widows with key information
-        display_columns = ["תורם", "סכום חודשי", "מספר ילדים", "שם"]
-        available_columns = [col for col in display_columns if col in almanot_df.columns]
-
-        if len(available_columns) > 0:
-            # Sort by monthly amount (descending) to show supported widows first
-            sorted_widows = almanot_df.sort_values("סכום חודשי", ascending=False)
-            # Display table without index and with proper column order
-            st.dataframe(
-                sorted_widows[available_columns], use_container_width=True, hide_index=True
-            )
-        else:
-            st.warning("⚠️ לא ניתן לטעון טבלת אלמנות")
-
-    except Exception as e:
-        st.error("שגיאה בטעינת טבלת אלמנות")
-        logging.error(f"Widows table error: {e}")
-
+    _render_widows_table(almanot_df)
     add_spacing(3)
 
 
@@ -389,6 +541,105 @@ def create_residential_breakdown_section(almanot_df: pd.DataFrame, donations_df:
     add_spacing(2)
 
 
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def _donor_lookup(
+    donations_df: pd.DataFrame, investors_df: pd.DataFrame
+) -> Tuple[frozenset, list, tuple, tuple]:
+    """Collect every donor name and normalize it once, reused while the donor sheets are unchanged"""
+    all_donors = set()
+    if "שם" in donations_df.columns:
+        all_donors |= _distinct_names(donations_df["שם"])
+    if "שם" in investors_df.columns:
+        all_donors |= _distinct_names(investors_df["שם"])
+
+    donor_forms = _build_donor_forms(all_donors)
+    return (
+        frozenset(all_donors),
+        donor_forms,
+        _build_donor_index(donor_forms),
+        _build_trigram_indexes(donor_forms),
+    )
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def _build_network_graph(
+    donations_df: pd.DataFrame,
+    almanot_df: pd.DataFrame,
+    investors_df: pd.DataFrame,
+    min_support_amount: float,
+) -> Tuple[List[str], List[str], List[str], List[str], List[Dict]]:
+    """Match widows to donors and return sorted connected/unconnected names and support edges"""
+    # Clean monthly support data - numeric with NaN as 0, kept local so the caller's
+    # frame (and its cache hash) is left untouched
+    if "סכום חודשי" in almanot_df.columns:
+        support = pd.to_numeric(almanot_df["סכום חודשי"], errors="coerce").fillna(0)
+
+        # Apply minimum support amount filter
+        keep = support >= min_support_amount
+        almanot_df = almanot_df[keep]
+        supports = support[keep].to_numpy()
+    else:
+        supports = np.zeros(len(almanot_df))
+
+    # Get all valid donors with normalized names
+    all_donors, donor_forms, donor_index, trigram_indexes = _donor_lookup(
+        donations_df, investors_df
+    )
+
+    # Categorize nodes for layout
+    connected_donors = set()
+    connected_widows = set()
+    unconnected_widows = set()
+    edges = []
+
+    # Identify connected pairs with fuzzy matching, resolved once per distinct donor spelling
+    if "שם" in almanot_df.columns:
+        donors = pd.Series(_column_values(almanot_df, "תורם"), dtype=object)
+        donor_matches = {}
+        for donor in donors.dropna().unique():
+            donor_str = str(donor).strip()
+            # Exact match first
+            if donor_str in all_donors:
+                donor_matches[donor] = donor_str
+            else:
+                donor_matches[donor] = _match_donor(
+                    donor_str, donor_forms, donor_index, trigram_indexes
+                )
+        matched = donors.map(donor_matches).to_numpy()
+
+        widow_names = almanot_df["שם"].to_numpy(dtype=object)
+        has_widow = pd.notna(widow_names)
+        connected = has_widow & pd.notna(matched) & (supports > 0)
+
+        connected_donors = set(matched[connected])
+        connected_widows = set(widow_names[connected])
+        unconnected_widows = set(widow_names[has_widow & ~connected])
+        edges = [
+            {"from": donor, "to": widow_name, "arrows": "to", "label": f"₪{monthly_support:,.0f}"}
+            for donor, widow_name, monthly_support in zip(
+                matched[connected], widow_names[connected], supports[connected]
+            )
+        ]
+
+    # Sort once so cached results render in order, splitting donors in the same pass
+    connected_donor_names = []
+    unconnected_donor_names = []
+    for donor in sorted(all_donors):
+        if donor in connected_donors:
+            connected_donor_names.append(donor)
+        else:
+            unconnected_donor_names.append(donor)
+
+    return (
+        connected_donor_names,
+        sorted(connected_widows),
+        unconnected_donor_names,
+        sorted(unconnected_widows),
+        edges,
+    )
+
+
+@st.fragment
 def create_network_section(
     expenses_df: pd.DataFrame,
     donations_df: pd.DataFrame,
@@ -450,324 +701,50 @@ def create_network_section(
     # Clean interface - no status messages
 
     try:
-        # Clean monthly support data - ensure all values are numeric and NaN is treated as 0
-        if "סכום חודשי" in almanot_df.columns:
-            almanot_df["סכום חודשי"] = pd.to_numeric(
-                almanot_df["סכום חודשי"], errors="coerce"
-            ).fillna(0)
-
-            # Apply minimum support amount filter
-            almanot_df = almanot_df[almanot_df["סכום חודשי"] >= min_support_amount]
-
-        # Create nodes and edges for the network
-        nodes = []
-        edges = []
-
-        # Get all valid donors with normalized names
-        all_donors = set()
-        donor_name_mapping = {}  # Map normalized names to original names
-
-        if "שם" in donations_df.columns:
-            donors_from_donations = donations_df["שם"].dropna().unique()
-            for donor in donors_from_donations:
-                normalized = str(donor).strip()  # Remove extra spaces
-                all_donors.add(normalized)
-                donor_name_mapping[normalized] = str(donor)
-
-        if "שם" in investors_df.columns:
-            investors_names = investors_df["שם"].dropna().unique()
-            for investor in investors_names:
-                normalized = str(investor).strip()  # Remove extra spaces
-                all_donors.add(normalized)
-                donor_name_mapping[normalized] = str(investor)
-
-        # Categorize nodes for layout
-        connected_donors = set()
-        connected_widows = set()
-        unconnected_donors = set()
-        unconnected_widows = set()
-
-        # First pass: identify connected pairs with fuzzy matching
-        if "שם" in almanot_df.columns:
-            for _, widow in almanot_df.iterrows():
-                widow_name = widow["שם"]
-                if pd.notna(widow_name):
-                    donor = widow.get("תורם")
-                    monthly_support = widow.get("סכום חודשי")
-
-                    # Handle missing monthly support values - treat NaN/non-numbers as 0
-                    if pd.isna(monthly_support) or monthly_support == "" or monthly_support == 0:
-                        monthly_support = 0
-                    else:
-                        try:
-                            monthly_support = float(monthly_support)
-                            # If conversion results in NaN, treat as 0
-                            if pd.isna(monthly_support):
-                                monthly_support = 0
-                        except (ValueError, TypeError):
-                            monthly_support = 0
-
-                    # Try to find matching donor with fuzzy matching
-                    matched_donor = None
-                    if pd.notna(donor):
-                        donor_str = str(donor).strip()
-                        # Exact match first
-                        if donor_str in all_donors:
-                            matched_donor = donor_str
-                        else:
-                            # Try partial matching
-                            for potential_donor in all_donors:
-                                if (
-                                    donor_str in potential_donor
-                                    or potential_donor in donor_str
-                                    or donor_str.lower() == potential_donor.lower()
-                                ):
-                                    matched_donor = potential_donor
-                                    break
-
-                            # If still no match, try more aggressive matching
-                            if not matched_donor:
-                                for potential_donor in all_donors:
-                                    # Remove common prefixes/suffixes and try again
-                                    clean_donor = (
-                                        donor_str.replace('בע"מ', "")
-                                        .replace("עמותת", "")
-                                        .replace("חברה", "")
-                                        .strip()
-                                    )
-                                    clean_potential = (
-                                        potential_donor.replace('בע"מ', "")
-                                        .replace("עמותת", "")
-                                        .replace("חברה", "")
-                                        .strip()
-                                    )
-
-                                    if (
-                                        clean_donor in clean_potential
-                                        or clean_potential in clean_donor
-                                        or clean_donor.lower() == clean_potential.lower()
-                                    ):
-                                        matched_donor = potential_donor
-                                        break
-
-                                # If still no match, try handling abbreviations and initials
-                                if not matched_donor:
-                                    for potential_donor in all_donors:
-                                        # Handle abbreviations like "א.ל." -> "אל"
-                                        clean_donor = donor_str
-                                        clean_potential = potential_donor
-
-                                        # Remove dots and spaces from abbreviations
-                                        clean_donor = re.sub(r"\.\s*", "", clean_donor)
-                                        clean_potential = re.sub(r"\.\s*", "", clean_potential)
-
-                                        # Try matching cleaned names
-                                        if (
-                                            clean_donor in clean_potential
-                                            or clean_potential in clean_donor
-                                            or clean_donor.lower() == clean_potential.lower()
-                                        ):
-                                            matched_donor = potential_donor
-                                            break
-
-                    if matched_donor and monthly_support > 0:
-                        # Connected pair
-                        connected_donors.add(matched_donor)
-                        connected_widows.add(widow_name)
-
-                        # Add edge only if showing connected
-                        if show_connected:
-                            edges.append(
-                                {
-                                    "from": matched_donor,
-                                    "to": widow_name,
-                                    "arrows": "to",
-                                    "label": f"₪{monthly_support:,.0f}",
-                                }
-                            )
-                    else:
-                        # Unconnected widow
-                        unconnected_widows.add(widow_name)
-
-        # Identify unconnected donors
-        unconnected_donors = all_donors - connected_donors
-
-        # Add nodes with area constraints for natural floating - RESPECT FILTERS
-
-        # Left area: Unconnected widows (will float naturally in left area)
-        if show_unconnected_widows:
-            for widow_name in sorted(unconnected_widows):
-                nodes.append(
-                    {
-                        "id": widow_name,
-                        "label": widow_name if show_labels else "",
-                        "group": "widow_unconnected",
-                        "title": "אלמנה ללא קשר",
-                        "color": "#ffb347",  # Light orange for unconnected widows
-                        "size": 18,
-                        "font": {"size": 7, "color": "#000000", "face": "Arial", "bold": True},
-                    }
-                )
-
-        # Middle area: Connected pairs (will float naturally in middle area)
-        if show_connected:
-            for donor in sorted(connected_donors):
-                nodes.append(
-                    {
-                        "id": donor,
-                        "label": donor if show_labels else "",
-                        "group": "donor_connected",
-                        "title": "תורם מחובר",
-                        "color": "#1f77b4",  # Blue for connected donors
-                        "size": 25,
-                        "font": {"size": 8, "color": "#000000", "face": "Arial", "bold": True},
-                    }
-                )
-
-            for widow in sorted(connected_widows):
-                nodes.append(
-                    {
-                        "id": widow,
-                        "label": widow if show_labels else "",
-                        "group": "widow_connected",
-                        "title": "אלמנה מחוברת",
-                        "color": "#ff7f0e",  # Orange for connected widows
-                        "size": 22,
-                        "font": {"size": 7, "color": "#000000", "face": "Arial", "bold": True},
-                    }
-                )
-
-        # Right area: Unconnected donors (will float naturally in right area)
-        if show_unconnected_donors:
-            for donor_name in sorted(unconnected_donors):
-                nodes.append(
-                    {
-                        "id": donor_name,
-                        "label": donor_name if show_labels else "",
-                        "group": "donor_unconnected",
-                        "title": "תורם ללא קשר",
-                        "color": "#87ceeb",  # Light blue for unconnected donors
-                        "size": 20,
-                        "font": {"size": 7, "color": "#000000", "face": "Arial", "bold": True},
-                    }
-                )
+        (
+            connected_donors,
+            connected_widows,
+            unconnected_donors,
+            unconnected_widows,
+            edges,
+        ) = _build_network_graph(donations_df, almanot_df, investors_df, min_support_amount)
+
+        # Show edges only if showing connected
+        if not show_connected:
+            edges = []
+
+        # Create nodes for the network, with area constraints for natural floating - RESPECT FILTERS
+        node_groups = (
+            # Left area: Unconnected widows (will float naturally in left area)
+            (show_unconnected_widows, unconnected_widows, "widow_unconnected", "אלמנה ללא קשר"),
+            # Middle area: Connected pairs (will float naturally in middle area)
+            (show_connected, connected_donors, "donor_connected", "תורם מחובר"),
+            (show_connected, connected_widows, "widow_connected", "אלמנה מחוברת"),
+            # Right area: Unconnected donors (will float naturally in right area)
+            (show_unconnected_donors, unconnected_donors, "donor_unconnected", "תורם ללא קשר"),
+        )
 
         # Create network visualization
-        if nodes:
+        if any(shown and names for shown, names, _, _ in node_groups):
             # Add custom CSS and JavaScript for area constraints
-            st.markdown(
-                """
-            <style>
-            /* Force all text in network view to be black */
-            .stPlotlyChart, .stPlotlyChart * {
-                color: #000000 !important;
-            }
-            /* Network specific text colors */
-            .vis-network, .vis-network * {
-                color: #000000 !important;
-            }
-            /* Edge labels */
-            .vis-edge-label {
-                color: #000000 !important;
-                background-color: #ffffff !important;
-            }
-            /* Make network use full available width */
-            .stPlotlyChart {
-                width: 100% !important;
-                max-width: none !important;
-            }
-            /* Ensure the agraph container uses full width */
-            .stPlotlyChart > div {
-                width: 100% !important;
-                max-width: none !important;
-            }
-            </style>
-
-            <script>
-            // Add area constraints after network loads
-            setTimeout(function() {
-                const network = document.querySelector('.vis-network');
-                if (network && network.__vis_network) {
-                    const visNetwork = network.__vis_network;
-
-                    // Add physics constraints for area separation with extremely tight areas
-                    visNetwork.on('stabilizationProgress', function(params) {
-                        // Constrain nodes to their designated areas
-                        const nodes = visNetwork.body.data.nodes;
-                        nodes.forEach(function(node) {
-                            if (node.group === 'widow_unconnected') {
-                                // Keep unconnected widows on left side - extremely tight area
-                                if (node.x > -10) node.x = -10;
-                            } else if (node.group === 'donor_unconnected') {
-                                // Keep unconnected donors on right side - extremely tight area
-                                if (node.x < 10) node.x = 10;
-                            } else if (node.group === 'donor_connected' || node.group === 'widow_connected') {
-                                // Keep connected pairs in middle area - extremely tight area
-                                if (node.x < -10 || node.x > 10) node.x = 0;
-                            }
-                        });
-                    });
-                }
-            }, 1000);
-            </script>
-            """,
-                unsafe_allow_html=True,
-            )
-
-            try:
-                from streamlit_agraph import Config, Edge, Node, agraph
-
-                # Convert to agraph format with natural floating
-                agraph_nodes = []
-                for node in nodes:
-                    if node["group"] == "donor_connected":
-                        # Connected donor (middle, blue)
-                        agraph_nodes.append(
-                            Node(
-                                id=node["id"],
-                                label=node["label"],
-                                size=25,
-                                color="#1f77b4",  # Blue
-                                font={"size": 8, "color": "#000000", "face": "Arial", "bold": True},
-                                title=node["title"],
-                            )
-                        )
-                    elif node["group"] == "widow_connected":
-                        # Connected widow (middle, orange)
-                        agraph_nodes.append(
-                            Node(
-                                id=node["id"],
-                                label=node["label"],
-                                size=22,
-                                color="#ff7f0e",  # Orange
-                                font={"size": 7, "color": "#000000", "face": "Arial", "bold": True},
-                                title=node["title"],
-                            )
-                        )
-                    elif node["group"] == "donor_unconnected":
-                        # Unconnected donor (right side, light blue)
-                        agraph_nodes.append(
-                            Node(
-                                id=node["id"],
-                                label=node["label"],
-                                size=20,
-                                color="#87ceeb",  # Light blue
-                                font={"size": 7, "color": "#000000", "face": "Arial", "bold": True},
-                                title=node["title"],
-                            )
-                        )
-                    elif node["group"] == "widow_unconnected":
-                        # Unconnected widow (left side, light orange)
-                        agraph_nodes.append(
-                            Node(
-                                id=node["id"],
-                                label=node["label"],
-                                size=18,
-                                color="#ffb347",  # Light orange
-                                font={"size": 7, "color": "#000000", "face": "Arial", "bold": True},
-                                title=node["title"],
-                            )
-                        )
+            st.markdown(_NETWORK_CSS_JS, unsafe_allow_html=True)
+
+            if _HAS_AGRAPH:
+                # Build agraph nodes straight from the groups, natural floating by group
+                agraph_nodes = [
+                    Node(
+                        id=name,
+                        label=name if show_labels else "",
+                        size=size,
+                        color=color,
+                        font=font,
+                        title=title,
+                    )
+                    for shown, names, group, title in node_groups
+                    if shown
+                    for size, color, font in (_GROUP_STYLE[group],)
+                    for name in names
+                ]
 
                 agraph_edges = (
                     [
@@ -778,10 +755,7 @@ def create_network_section(
                             label=edge["label"],
                             color="#333333",  # Darker color for better visibility
                             width=1.5,  # Thinner lines for cleaner look
-                            font={
-                                "size": 8,
-                                "color": "#000000",
-                            },  # Small, black text for edge labels
+                            font=_EDGE_FONT,  # Small, black text for edge labels
                         )
                         for edge in edges
                     ]
@@ -811,8 +785,7 @@ def create_network_section(
 
                 # Use full width for the network graph
                 agraph(nodes=agraph_nodes, edges=agraph_edges, config=config)
-
-            except ImportError:
+            else:
                 st.warning("⚠️ streamlit-agraph לא מותקן. התקן עם: pip install streamlit-agraph")
                 st.info("מפת קשרים תציג כאן לאחר התקנת streamlit-agraph")
         else: